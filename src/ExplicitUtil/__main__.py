@@ -1,22 +1,44 @@
-from .convert_pic_to_webp import convert_pic_to_webp_multithreaded
-from .nfo_tool import generate_nfo
-from .recursive_namer import process_video_files
-from .recursive_unzip import recursive_unzip
-from .remove_empty import remove_empty_folders
-from .whisper_cpp_transcribe import transcribe_videos
-from .zip_and_move import async_zip_and_move
-from .group_files import group_files_by_string, move_grouped_files
+import argparse
 import importlib.resources
 import os
 from pathlib import Path
-import asyncio
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+import tomli_w
 
 __docformat__ = "google"
+# Resolve the bundled config directory once instead of in every menu action.
+_CONFIG_DIR = Path(str(importlib.resources.files('ExplicitUtil').joinpath('config')))
+_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _save_config(config_path: Path, config: dict) -> None:
+    """Write a config file, skipping the write when its contents are unchanged.
+    The file is replaced atomically so an interrupted run never leaves it truncated.
+
+    Args:
+        config_path (Path): Destination TOML file.
+        config (dict): Settings to store.
+    """
+    data = tomli_w.dumps(config).encode()
+    try:
+        if config_path.read_bytes() == data:
+            return
+    except OSError:
+        pass  # Missing or unreadable; write a fresh copy
+    tmp_path = config_path.with_suffix(".toml.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, config_path)
+    print(f"Config saved to {config_path}")
+
+
 def choice1() -> None:
     """Convert images to WebP format."""
-    config_path = Path(str(importlib.resources.files('ExplicitUtil').joinpath('config/convert_pic_to_webp.toml')))
-    config_path.parent.mkdir(parents=True, exist_ok=True)
+    # Imported here so the CLI only loads what the chosen action needs.
+    from .convert_pic_to_webp import convert_pic_to_webp_multithreaded
+    config_path = _CONFIG_DIR / 'convert_pic_to_webp.toml'
     default_config = {"num_threads": 6, "timeout": 10, "quality": 80}
     use_config = False
     # Load configuration from file if available
@@ -25,7 +47,8 @@ def choice1() -> None:
         if use_config:
             # Load the config file
             try:
-                config = toml.load(config_path)
+                with open(config_path, "rb") as config_file:
+                    config = tomllib.load(config_file)
                 default_config.update({k: config.get(k, v) for k, v in default_config.items()})
 
             except Exception as e:
@@ -42,9 +65,7 @@ def choice1() -> None:
                     default_config[key] = int(value)
                 except ValueError:
                     print(f"Invalid input for {key}. Using default: {default}.")
-        with open(config_path, "w") as config_file:
-            toml.dump(default_config, config_file)
-            print(f"Config saved to {config_path}")
+        _save_config(config_path, default_config)
     folder_path = input("Enter the folder path to convert picture files: ").strip('"')
     if not Path(folder_path).exists():
         print(f"Error: Folder '{folder_path}' does not exist.")
@@ -62,6 +83,7 @@ def choice1() -> None:
 
 def choice2() -> None:
     """generate nfo files"""
+    from .nfo_tool import generate_nfo
     media_path = input("Enter the media directory path: ")
     if not Path(media_path).exists():
         print(f"Error: Media directory '{media_path}' does not exist.")
@@ -85,16 +107,18 @@ def choice2() -> None:
 
 def choice3() -> None:
     """process video files"""
-    NAMER_CONFIG_DEFAULT = str(importlib.resources.files('ExplicitUtil').joinpath('config/.namer.cfg'))
+    from .recursive_namer import process_video_files
+    NAMER_CONFIG_DEFAULT = str(_CONFIG_DIR / '.namer.cfg')
     default_config = {"namer_config_path":NAMER_CONFIG_DEFAULT,"suffix": (".m4v", ".mp4"), "endswith": ""}
     # Load configuration from file if available
-    config_path = Path(str(importlib.resources.files('ExplicitUtil').joinpath('config/recursive_namer.toml')))
+    config_path = _CONFIG_DIR / 'recursive_namer.toml'
     use_config = False
     if Path(config_path).is_file():
         use_config = input("Use stored config for settings? (y/n): ").strip().lower() == "y"
         if use_config:
             try:
-                config = toml.load(config_path)
+                with open(config_path, "rb") as config_file:
+                    config = tomllib.load(config_file)
                 default_config.update({k: config.get(k, v) for k, v in default_config.items()})
             except Exception as e:
                 print(f"Error loading config file: {e}")
@@ -113,15 +137,13 @@ def choice3() -> None:
             if value == "default":
                 value = default_config[key]
             if value:
-                if key == "suffix" and value is str:
+                if key == "suffix" and isinstance(value, str):
                     value = tuple(ext.strip() for ext in value.split(","))
                 default_config[key] = value
         if not Path(default_config["namer_config_path"]).is_file():
             print(f"Error: Configuration file '{default_config['namer_config_path']}' not found.")
             return
-        with open(config_path, "w") as config_file:
-            toml.dump(default_config, config_file)
-            print(f"Config saved to {config_path}")
+        _save_config(config_path, default_config)
     # print(NAMER_CONFIG_DEFAULT)
     folder_path = Path(
         input("Enter the folder path to video files: ").strip('"').strip("'")  # remove quotes
@@ -139,6 +161,7 @@ def choice3() -> None:
 
 def choice4() -> None:
     """unzip files recursively"""
+    from .recursive_unzip import recursive_unzip
     folder_path = Path(input("Enter the folder path to unzip files: ").strip('"'))
     delete_zips = input("Delete ZIP archives after unzipping? (y/n): ").strip().lower()=='y'
 
@@ -156,6 +179,7 @@ def choice4() -> None:
 
 def choice5() -> None:
     """remove empty folders"""
+    from .remove_empty import remove_empty_folders
     target_dir = input("Please enter the target directory: ").strip("\"")
     dry_run = input("Do you want to perform a dry run? (y/n): ").strip().lower() == 'y'
     
@@ -173,16 +197,27 @@ def choice5() -> None:
 
 def choice6() -> None:
     """transcribe videos with Whisper.cpp"""
-    config_path = Path(str(importlib.resources.files('ExplicitUtil').joinpath('config/whisper_cpp_transcribe.toml')))
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    default_config = {"whisper_root": "", "suffix": (".m4v", ".mp4"), "prompt": ""}
+    from .whisper_cpp_transcribe import transcribe_videos
+    config_path = _CONFIG_DIR / 'whisper_cpp_transcribe.toml'
+    default_config = {
+        "whisper_root": "",
+        "suffix": (".m4v", ".mp4"),
+        "prompt": "",
+        "audio_filter": "highpass=200,lowpass=3000",
+        "batch_size": 8,
+        "ffmpeg_batch_size": 1,
+        "overwrite": False,
+        "whisper_workers": 1,
+        "ffmpeg_workers": 2,
+    }
     use_config = False
     # Load configuration from file if available
     if config_path.is_file():
         use_config = input("Use stored config for settings? (y/n): ").strip().lower() == "y"
         if use_config:
             try:
-                config = toml.load(config_path)
+                with open(config_path, "rb") as config_file:
+                    config = tomllib.load(config_file)
                 default_config.update({k: config.get(k, v) for k, v in default_config.items()})           
             except Exception as e:
                 print(f"Error loading config file: {e}")
@@ -197,28 +232,50 @@ def choice6() -> None:
                 print("Enter the prompt for Whisper transcription:")
             if key == "suffix":
                 print("Enter NOT case sensitive suffix strings split with comma (e.g., .m4v,.mp4):")
+            if key == "audio_filter":
+                print("Enter the FFmpeg audio filter applied before transcription.")
+                print("Append ',afftdn,dialoguenhance' to denoise noisy sources (much slower):")
+            if key == "batch_size":
+                print("Enter how many videos one whisper-cli run may transcribe (WAVs wait on disk):")
+            if key == "ffmpeg_batch_size":
+                print("Enter how many videos one FFmpeg process decodes (raise for many short clips):")
+            if key == "overwrite":
+                print("Re-transcribe videos that already have an up-to-date .srt? (y/n):")
+            if key == "whisper_workers":
+                print("Enter how many whisper-cli processes run at once (e.g., 2 on a many-core CPU or 2 GPUs):")
+            if key == "ffmpeg_workers":
+                print("Enter how many FFmpeg processes extract audio at once:")
             print("Enter 'default' to use default value")
             value = input(f"Enter {key.replace('_', ' ')} (default: {default}): ").strip()
             if value == "default":
                 value = default_config[key]
+            if value and isinstance(default, bool) and isinstance(value, str):
+                default_config[key] = value.lower() in ("y", "yes", "true", "1")
+                continue
+            if value and isinstance(default, int) and isinstance(value, str):
+                try:
+                    value = int(value)
+                except ValueError:
+                    print(f"Invalid input for {key}. Using default: {default}.")
+                    continue
             if value:
-                if key == "suffix" and value is str:
+                if key == "suffix" and isinstance(value, str):
                     value = tuple(ext.strip() for ext in value.split(","))
                 default_config[key] = value
         if not Path(default_config["whisper_root"]).is_dir():
             print(f"Error: Directory '{default_config['whisper_root']}' not found.")
             return
-        with open(config_path, "w") as config_file:
-            toml.dump(default_config, config_file)
-            print(f"Config saved to {config_path}")
+        _save_config(config_path, default_config)
     input_folder= input("Enter the folder path to video files: ").strip('"')
-    transcribe_videos(input_folder, default_config["whisper_root"], prompt=default_config["prompt"], suffix=default_config["suffix"])
+    transcribe_videos(input_folder, default_config["whisper_root"], prompt=default_config["prompt"], suffix=default_config["suffix"], audio_filter=default_config["audio_filter"], batch_size=default_config["batch_size"], ffmpeg_batch_size=default_config["ffmpeg_batch_size"], overwrite=default_config["overwrite"], whisper_workers=default_config["whisper_workers"], ffmpeg_workers=default_config["ffmpeg_workers"])
     return
 
 
 
 def choice7() -> None:
     """zip and move folders"""
+    import asyncio
+    from .zip_and_move import async_zip_and_move
     source_folder = Path(input("Enter the source folder path: ").strip("\""))
     if not source_folder.is_dir():
         print(f"The folder '{source_folder}' does not exist.")
@@ -236,6 +293,7 @@ def choice7() -> None:
 
 def choice8() -> None:
     """group files by regex matching"""
+    from .group_files import group_files_by_string, move_grouped_files
     directory = Path(input("Enter the directory path: ").strip('"'))
     print("Default regex pattern: r'(\d{4}-\d{2}-\d{2})'")
     custom_regex = input("Do you want to use a custom regex pattern? (y/n): ").strip().lower() == 'y'
@@ -250,7 +308,184 @@ def choice8() -> None:
     if proceed:
         move_grouped_files(directory, grouped_files)
 
-def main() -> None:
+def _existing_dir(value: str) -> Path:
+    """argparse type for a directory argument that must already exist."""
+    path = Path(value.strip('"')).expanduser()
+    if not path.is_dir():
+        raise argparse.ArgumentTypeError(f"directory '{value}' does not exist")
+    return path.resolve()
+
+
+def _suffixes(value: str) -> tuple[str, ...]:
+    """argparse type for a comma-separated list of file extensions."""
+    return tuple(ext.strip() for ext in value.split(",") if ext.strip())
+
+
+def _run_webp(args: argparse.Namespace) -> None:
+    """convert images to WebP (subcommand)"""
+    from .convert_pic_to_webp import convert_pic_to_webp_multithreaded
+    convert_pic_to_webp_multithreaded(
+        folder_path=str(args.folder),
+        num_threads=args.num_threads,
+        timeout=args.timeout,
+        quality=args.quality,
+    )
+
+
+def _run_nfo(args: argparse.Namespace) -> None:
+    """generate nfo files (subcommand)"""
+    from .nfo_tool import generate_nfo
+    os.makedirs(args.output_dir, exist_ok=True)
+    generate_nfo(str(args.media_path), args.media_type, args.output_dir)
+
+
+def _run_rename(args: argparse.Namespace) -> None:
+    """process video files (subcommand)"""
+    from .recursive_namer import process_video_files
+    process_video_files(root_dir=args.folder, namer_config=args.namer_config, suffix=args.suffix, endswith=args.endswith)
+
+
+def _run_unzip(args: argparse.Namespace) -> None:
+    """unzip files recursively (subcommand)"""
+    from .recursive_unzip import recursive_unzip
+    recursive_unzip(args.folder, args.delete_zips)
+
+
+def _run_remove_empty(args: argparse.Namespace) -> None:
+    """remove empty folders (subcommand)"""
+    from .remove_empty import remove_empty_folders
+    remove_empty_folders(str(args.folder), args.dry_run)
+
+
+def _run_transcribe(args: argparse.Namespace) -> None:
+    """transcribe videos with Whisper.cpp (subcommand)"""
+    from .whisper_cpp_transcribe import transcribe_videos
+    transcribe_videos(
+        args.input_folder,
+        args.whisper_root,
+        prompt=args.prompt,
+        suffix=args.suffix,
+        pipe_audio=args.pipe_audio,
+        audio_filter=args.audio_filter,
+        batch_size=args.batch_size,
+        ffmpeg_batch_size=args.ffmpeg_batch_size,
+        overwrite=args.overwrite,
+        whisper_workers=args.whisper_workers,
+        ffmpeg_workers=args.ffmpeg_workers,
+    )
+
+
+def _run_zip_move(args: argparse.Namespace) -> None:
+    """zip and move folders (subcommand)"""
+    import asyncio
+    from .zip_and_move import async_zip_and_move
+    args.destination_folder.mkdir(parents=True, exist_ok=True)
+    asyncio.run(async_zip_and_move(args.source_folder, args.destination_folder, args.codec))
+
+
+def _run_group(args: argparse.Namespace) -> None:
+    """group files by regex matching (subcommand)"""
+    from .group_files import group_files_by_string, move_grouped_files
+    grouped_files = group_files_by_string(args.directory, args.regex)
+    for key, files in grouped_files.items():
+        print(f"{key}: {files}")
+    if args.move:
+        move_grouped_files(args.directory, grouped_files)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser; every menu action is also a subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="ExplicitUtil",
+        description="Media file utilities. Run without a command for the interactive menu.",
+    )
+    sub = parser.add_subparsers(dest="cmd", metavar="command")
+
+    p = sub.add_parser("webp", help="Convert images to WebP")
+    p.add_argument("folder", type=_existing_dir)
+    p.add_argument("--num-threads", type=int, default=6)
+    p.add_argument("--timeout", type=int, default=10)
+    p.add_argument("--quality", type=int, default=80)
+    p.set_defaults(func=_run_webp)
+
+    p = sub.add_parser("nfo", help="Generate NFO files")
+    p.add_argument("media_path", type=_existing_dir)
+    p.add_argument("media_type", choices=("movie", "episode", "musicvideo"))
+    p.add_argument("output_dir")
+    p.set_defaults(func=_run_nfo)
+
+    p = sub.add_parser("rename", help="Batch rename video files with namer")
+    p.add_argument("folder", type=_existing_dir)
+    p.add_argument("--namer-config", default=str(_CONFIG_DIR / '.namer.cfg'))
+    p.add_argument("--suffix", type=_suffixes, default=(".m4v", ".mp4"))
+    p.add_argument("--endswith", default="")
+    p.set_defaults(func=_run_rename)
+
+    p = sub.add_parser("unzip", help="Unzip files recursively")
+    p.add_argument("folder", type=_existing_dir)
+    p.add_argument("--delete-zips", action="store_true")
+    p.set_defaults(func=_run_unzip)
+
+    p = sub.add_parser("remove-empty", help="Remove empty folders")
+    p.add_argument("folder", type=_existing_dir)
+    p.add_argument("--dry-run", action="store_true")
+    p.set_defaults(func=_run_remove_empty)
+
+    p = sub.add_parser("transcribe", help="Transcribe videos with Whisper.cpp")
+    p.add_argument("input_folder", type=_existing_dir)
+    p.add_argument("--whisper-root", type=_existing_dir, required=True)
+    p.add_argument("--prompt", default="")
+    p.add_argument("--suffix", type=_suffixes, default=(".m4v", ".mp4"))
+    p.add_argument("--audio-filter", default="highpass=200,lowpass=3000")
+    p.add_argument("--batch-size", type=int, default=8)
+    p.add_argument("--ffmpeg-batch-size", type=int, default=1)
+    p.add_argument("--pipe-audio", action="store_true")
+    p.add_argument("--overwrite", action="store_true")
+    p.add_argument("--whisper-workers", type=int, default=1)
+    p.add_argument("--ffmpeg-workers", type=int, default=2)
+    p.set_defaults(func=_run_transcribe)
+
+    p = sub.add_parser("zip-move", help="Zip and move folders")
+    p.add_argument("source_folder", type=_existing_dir)
+    p.add_argument("destination_folder", type=Path)
+    p.add_argument(
+        "--codec",
+        choices=["zip", "isal", "zstd"],
+        default="zip",
+        help="zip (default), isal (zip deflated with ISA-L) or zstd (.tar.zst)",
+    )
+    p.set_defaults(func=_run_zip_move)
+
+    p = sub.add_parser("group", help="Group files by regex matching")
+    p.add_argument("directory", type=_existing_dir)
+    p.add_argument("--regex", default=r"(\d{4}-\d{2}-\d{2})")
+    p.add_argument("--move", action="store_true", help="Move the files into one folder per match")
+    p.set_defaults(func=_run_group)
+    return parser
+
+
+_MENU = {
+    1: choice1,
+    2: choice2,
+    3: choice3,
+    4: choice4,
+    5: choice5,
+    6: choice6,
+    7: choice7,
+    8: choice8,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a subcommand, or the interactive menu when none is given.
+
+    Args:
+        argv (list[str], optional): Arguments to parse instead of sys.argv.
+    """
+    args = _build_parser().parse_args(argv)
+    if args.cmd is not None:
+        args.func(args)
+        return
     while True:
         print("ExplicitUtil CLI")
         print("1. Convert images to WebP")
@@ -263,33 +498,21 @@ def main() -> None:
         print("8. Group files by regex matching")
         print("Type 'exit' to quit the program.")
 
-        choice = input("Choose an option (1-7): ")
+        choice = input(f"Choose an option (1-{len(_MENU)}): ")
         if choice.lower() == "exit":
             print("Exiting...")
             break
         try:
             choice = int(choice)
         except ValueError:
-            print("Invalid input. Please enter a number between 1 and 7.")
+            print(f"Invalid input. Please enter a number between 1 and {len(_MENU)}.")
             continue
 
-        if choice == 1:
-            choice1()
-        elif choice == 2:
-            choice2()
-        elif choice == 3:
-            choice3()
-        elif choice == 4:
-            choice4()
-        elif choice == 5:
-            choice5()
-        elif choice == 6:
-            choice6()
-        elif choice == 7:
-            choice7()
-        else:
+        action = _MENU.get(choice)
+        if action is None:
             print("Invalid choice. Please try again.")
             continue
+        action()
 
 if __name__ == "__main__":
     main()
@@ -1,40 +1,87 @@
+import os
 import subprocess
 from pathlib import Path
-from PIL import Image
-import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import platform
 
 __docformat__ = "google"
+# Upper bound on files fed to one ``magick -script`` process in batch mode.
+_SCRIPT_BATCH_SIZE = 64
+
+
+def _is_valid_webp(webp_path: str | Path) -> bool:
+    """Checks that ImageMagick produced a complete WebP file.
+
+    Only the 12-byte RIFF/WEBP container header is read. A truncated file keeps
+    its header, so the RIFF size field must also account for the whole file.
+
+    Args:
+        webp_path (str or Path): Path to the WebP file.
+
+    Returns:
+        bool: True if the file has a WebP header and its full RIFF length, False otherwise.
+    """
+    try:
+        with open(webp_path, "rb") as f:
+            head = f.read(12)
+            size = os.fstat(f.fileno()).st_size
+    except OSError as e:
+        print(f"WebP validation failed: {e}")
+        return False
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WEBP":
+        print(f"WebP validation failed: {webp_path} is not a WebP file")
+        return False
+    if int.from_bytes(head[4:8], "little") + 8 != size:
+        print(f"WebP validation failed: {webp_path} is truncated")
+        return False
+    return True
+
+
+def _remove_if_exists(path: str) -> None:
+    """Deletes a file, ignoring it if it does not exist.
+
+    Args:
+        path (str): Path to the file.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
 def convert_single_pic(
-    pic_path: Path,
-    failed_count: dict,
+    pic_path: str | Path,
     timeout: int = 10,
-    progress_bar: tqdm | None = None,
     quality: int = 80,
-) -> None:
+    webp_path: str | None = None,
+) -> bool:
     """Converts a single pic file to WebP with a timeout.
     
     Args:
     
-        pic_path (Path): Path to the picture file.
-        failed_count (dict): Dictionary to count failed conversions.
+        pic_path (str or Path): Path to the picture file.
         timeout (int): Timeout in seconds
-        progress_bar (tqdm): Progress bar for tracking progress.
         quality (int): Quality of the WebP image.
+        webp_path (str): Path of the WebP file to write. Defaults to pic_path with a .webp suffix.
+
+    Returns:
+        bool: True if the conversion succeeded, False otherwise.
     """
-    webp_path = pic_path.with_suffix(".webp")
+    pic_path = os.fspath(pic_path)
+    if webp_path is None:
+        webp_path = os.path.splitext(pic_path)[0] + ".webp"
 
     try:
         if platform.system() == "Linux":
-            command = ["convert", str(pic_path), "-quality", str(quality), str(webp_path)]
+            command = ["convert", pic_path, "-quality", str(quality), webp_path]
         else:
             command = [
             "magick",
-            str(pic_path),
+            pic_path,
             "-quality",
             str(quality),
-            str(webp_path),
+            webp_path,
             ]
         process = subprocess.Popen(
             command,
@@ -46,43 +93,92 @@ def convert_single_pic(
         except subprocess.TimeoutExpired:
             process.kill()  # Kill the process if timeout occurs.
             print(f"Timeout converting {pic_path}")
-            with failed_count["lock"]:
-                failed_count["count"] += 1
-            if progress_bar:
-                progress_bar.update(1)
-            return
+            return False
 
         # if process.returncode != 0:
         #     print(f"Magick returned non-zero exit code for {pic_path}")
-        #     with failed_count["lock"]:
-        #         failed_count["count"] += 1
-        #     return
+        #     return False
 
-        try:
-            img = Image.open(webp_path)
-            img.close()
-        except (FileNotFoundError, OSError, Exception) as e:
-            print(f"WebP validation failed: {e}")
-            webp_path.unlink(missing_ok=True)
-            with failed_count["lock"]:
-                failed_count["count"] += 1
-            if progress_bar:
-                progress_bar.update(1)
-            return
+        if not _is_valid_webp(webp_path):
+            _remove_if_exists(webp_path)
+            return False
 
-        pic_path.unlink()
+        os.remove(pic_path)
         # tqdm.write(f"Converted and deleted: {pic_path}",end="\r")
+        return True
 
     except FileNotFoundError:
         # print("File not found. Please ensure it's in the folder.")
-        return
+        return False
     except Exception as e:
         tqdm.write(f"An unexpected error occurred during processing {pic_path}: {e}")
-        with failed_count["lock"]:
-            failed_count["count"] += 1
-    finally:
-        if progress_bar:
-            progress_bar.update(1)
+        return False
+
+
+def convert_batch_via_magick_script(
+    jobs: list[tuple[str, str]],
+    quality: int = 80,
+    timeout_per_file: int = 10,
+) -> int:
+    """Converts several pic files to WebP with a single ImageMagick process.
+
+    All conversions are written as one script to ``magick -script -`` so the
+    process startup cost is paid once per batch instead of once per file.
+    Files that the script fails to convert are retried one by one with
+    convert_single_pic. If the script times out, the whole batch is retried,
+    since an output may have been cut off mid-write when the process was killed.
+
+    Args:
+        jobs (list[tuple[str, str]]): (picture path, WebP path) pairs.
+        quality (int): Quality of the WebP images.
+        timeout_per_file (int): Timeout in seconds per file; the whole script gets
+            timeout_per_file * len(jobs) seconds.
+
+    Returns:
+        int: Number of failed conversions.
+    """
+    # Script tokens are single-quoted, which cannot contain a quote themselves.
+    retry = [job for job in jobs if "'" in job[0] or "'" in job[1]]
+    scripted = [job for job in jobs if "'" not in job[0] and "'" not in job[1]]
+
+    if scripted:
+        script = f"-quality {quality}\n" + "".join(
+            f"'{pic_path}' -write '{webp_path}' -delete 0--1\n"
+            for pic_path, webp_path in scripted
+        )
+        killed = False
+        try:
+            process = subprocess.Popen(
+                ["magick", "-script", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            try:
+                process.communicate(
+                    script.encode("utf-8"), timeout=timeout_per_file * len(scripted)
+                )
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                killed = True
+                print(f"Timeout converting batch starting at {scripted[0][0]}")
+        except FileNotFoundError:
+            # magick is not available, e.g. ImageMagick 6 on Linux.
+            pass
+
+        for pic_path, webp_path in scripted:
+            # Never delete a source based on the output of a killed run.
+            if not killed and os.path.isfile(webp_path) and _is_valid_webp(webp_path):
+                os.remove(pic_path)
+            else:
+                _remove_if_exists(webp_path)
+                retry.append((pic_path, webp_path))
+
+    return sum(
+        not convert_single_pic(pic_path, timeout_per_file, quality, webp_path)
+        for pic_path, webp_path in retry
+    )
 
 
 def convert_pic_to_webp_multithreaded(
@@ -91,6 +187,7 @@ def convert_pic_to_webp_multithreaded(
     timeout: int = 10,
     exts: tuple[str, ...] = (".heic", ".jpg", ".jpeg", ".png", ".tiff"),
     quality: int = 80,
+    batch_mode: bool = False,
 ) -> None:
     """
     Converts picture files to WebP using ImageMagick with multithreading, and counts failures.
@@ -98,44 +195,61 @@ def convert_pic_to_webp_multithreaded(
     Args:
     
         folder_path (str): Path to the folder containing HEIC files.        
-        num_threads (int): Number of threads to use. Default is 4.
+        num_threads (int): Number of worker processes to use. Default is 4.
         timeout (int): Timeout in seconds for each conversion. Default is 10 seconds.
         exts (tuple): File extensions to search for. Default is (".heic", ".jpg", ".jpeg", ".png", ".tiff").
         quality (int): Quality of the WebP image. Default is 80.
+        batch_mode (bool): Feed files to long-lived ``magick -script`` processes instead of
+            starting one ImageMagick process per file. Default is False.
     """
     folder = Path(folder_path)
-    pic_files = []
-    for ext in exts:
-        # Case-insensitive search
-        pic_files.extend(
-            list(folder.rglob(f"*{ext}")) + list(folder.rglob(f"*{ext.upper()}"))
-        )
+    # Single case-insensitive walk instead of two rglob passes per extension.
+    lowered_exts = tuple(ext.lower() for ext in exts)
+    # Workers get plain (source, target) strings: cheaper to pickle than Path objects
+    # and no per-file Path arithmetic in the workers.
+    jobs = [
+        (os.path.join(dirpath, name), os.path.join(dirpath, os.path.splitext(name)[0] + ".webp"))
+        for dirpath, _, filenames in os.walk(folder)
+        for name in filenames
+        if name.lower().endswith(lowered_exts)
+    ]
 
-    failed_count = {"count": 0, "lock": threading.Lock()}
+    failed_count = 0
 
-    threads = []
     with tqdm(
-        total=len(pic_files), desc="Converting picture to WebP", position=0, leave=True
-    ) as progress_bar:
-        # for pic_path in pic_files:
-        for pic_path in pic_files:
-            thread = threading.Thread(
-                target=convert_single_pic,
-                args=(pic_path, failed_count, timeout, progress_bar, quality),
-            )  # pass the timeout to the single heic function.
-            threads.append(thread)
-            thread.start()
-            progress_bar.set_postfix_str(pic_path.name)
-
-            if len(threads) >= num_threads:
-                for t in threads:
-                    t.join()
-                threads = []
-        progress_bar.update()
-        for t in threads:
-            t.join()
-
-    tqdm.write(f"Conversion completed. Failed conversions: {failed_count['count']}")
+        total=len(jobs),
+        desc="Converting picture to WebP",
+        position=0,
+        leave=True,
+        mininterval=0.2,
+    ) as progress_bar, ProcessPoolExecutor(max_workers=num_threads) as executor:
+        if batch_mode:
+            # Split the files so each worker gets a share, but keep batches small
+            # enough for the progress bar and the retry path to stay responsive.
+            chunk_size = max(1, min(_SCRIPT_BATCH_SIZE, -(-len(jobs) // num_threads)))
+            futures = {
+                executor.submit(
+                    convert_batch_via_magick_script, jobs[i : i + chunk_size], quality, timeout
+                ): jobs[i : i + chunk_size]
+                for i in range(0, len(jobs), chunk_size)
+            }
+            for future in as_completed(futures):
+                failed_count += future.result()
+                progress_bar.set_postfix_str(os.path.basename(futures[future][-1][0]))
+                progress_bar.update(len(futures[future]))
+        else:
+            # Each worker process runs magick and the WebP validation without sharing a GIL.
+            futures = {
+                executor.submit(convert_single_pic, pic_path, timeout, quality, webp_path): pic_path
+                for pic_path, webp_path in jobs
+            }
+            for future in as_completed(futures):
+                if not future.result():
+                    failed_count += 1
+                progress_bar.set_postfix_str(os.path.basename(futures[future]))
+                progress_bar.update(1)
+
+    tqdm.write(f"Conversion completed. Failed conversions: {failed_count}")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,17 @@
 from pathlib import Path
+import functools
 import re
 import os
 import shutil
 __docformat__ = "google"
 
 
+@functools.lru_cache(maxsize=64)
+def _compile(regex_pattern: str) -> re.Pattern:
+    """Compile a regex pattern, reusing the result across calls."""
+    return re.compile(regex_pattern)
+
+
 def group_files_by_string(directory: Path|str, regex_pattern: str = r"(\d{4}-\d{2}-\d{2})"):
     """Group files in a directory by a specific string in their name.
 
@@ -15,17 +22,18 @@ def group_files_by_string(directory: Path|str, regex_pattern: str = r"(\d{4}-\d{
     Returns:
         dict: A dictionary where the keys are the matched strings and the values are lists of file paths.
     """
-    directory = Path(directory)
     grouped_files = {}
-    pattern = re.compile(regex_pattern)
+    pattern = _compile(regex_pattern)
 
-    for file_path in directory.glob("*"):
-        match = pattern.search(file_path.name)
-        if match:
-            key = match.group(0)
-            if key not in grouped_files:
-                grouped_files[key] = []
-            grouped_files[key].append(file_path)
+    with os.scandir(directory) as it:
+        for entry in it:
+            # Only files are grouped; the group folders themselves would otherwise
+            # match on a second run and be moved into themselves.
+            if not entry.is_file():
+                continue
+            match = pattern.search(entry.name)
+            if match:
+                grouped_files.setdefault(match.group(0), []).append(Path(entry.path))
     # for key in grouped_files:
     #     os.makedirs(directory / key, exist_ok=True)
     #     print(f"Creating directory: {directory / key}")
@@ -43,12 +51,18 @@ def move_grouped_files(directory: Path|str , grouped_files: dict):
         directory (Path): The directory to move files into.
     """
     for key, files in grouped_files.items():
-        os.makedirs(directory / key, exist_ok=True)
-        print(f"Creating directory: {directory / key}")
+        dest_dir = os.path.join(directory, key)
+        os.makedirs(dest_dir, exist_ok=True)
+        moved = 0
         for file_path in files:
-            new_path = directory / key / file_path.name
-            shutil.move(file_path, new_path)
-            print(f"Moved {file_path} to {new_path}")
+            src = os.fspath(file_path)
+            dst = os.path.join(dest_dir, os.path.basename(src))
+            try:
+                os.rename(src, dst)  # Same filesystem: metadata-only move
+            except OSError:
+                shutil.move(src, dst)
+            moved += 1
+        print(f"Moved {moved} files to {dest_dir}")
 
 if __name__ == "__main__":
     # Example usage
@@ -1,9 +1,51 @@
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+from xml.sax.saxutils import escape
 from pathlib import Path
+import io
 import re
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 __docformat__ = "google"
+_ParseError = ET.XMLSyntaxError if _HAVE_LXML else ET.ParseError
+# .nfo files at least this large are streamed first to see whether they need any change.
+_PRESCAN_SIZE = 64 * 1024
+_MEDIA_EXTS = frozenset({".m4v", ".mp4", ".mkv", ".avi", ".mov", ".iso", ".vob", ".m2ts"})
+# Compiled once; detect_date_in_name runs for every media file. The three formats
+# share one alternation so each name is scanned in a single pass.
+_DATE_RE = re.compile(
+    r"(?P<y4>\d{4})[-_.](?P<m1>\d{2})[-_.](?P<d1>\d{2})"  # YYYY-MM-DD or YYYY_MM_DD or YYYY.MM.DD
+    r"|(?P<d2>\d{2})[-_.](?P<m2>\d{2})[-_.](?P<y4b>\d{4})"  # DD-MM-YYYY or DD_MM_YYYY or DD.MM.YYYY
+    r"|(?P<y2>\d{2})[-._](?P<m3>\d{2})[-._](?P<d3>\d{2})"  # YY-MM-DD or YY_MM_DD or YY.MM.DD
+)
+
+def _iter_files(root: str):
+    """Yields a DirEntry for every file below root.
+
+    Walks with os.scandir and an explicit stack, so no Path objects are created and
+    the entry type comes from the cached directory listing. Symlinked directories
+    are not followed.
 
-def process_single_file(file_path: Path, media_type: str, output_path: Path) -> None:
+    Args:
+        root (str): Directory to walk.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def process_single_file(
+    file_path: Path, media_type: str, output_path: Path, base_name: str | None = None
+) -> None:
     """Processes a single media file to generate or update its .nfo file.
 
     Args:
@@ -11,8 +53,10 @@ def process_single_file(file_path: Path, media_type: str, output_path: Path) ->
         file_path (Path): Path to the media file.
         media_type (str): Type of media (movie, episode, musicvideo).
         output_path (Path): Directory to save the generated .nfo file.
+        base_name (str): File name without extension, if already known. Defaults to file_path.stem.
     """
-    base_name = file_path.stem
+    if base_name is None:
+        base_name = file_path.stem
     nfo_filename = output_path / f"{base_name}.nfo"
     date = detect_date_in_name(base_name)
     if media_type == "movie":
@@ -32,7 +76,9 @@ def process_single_file(file_path: Path, media_type: str, output_path: Path) ->
             create_movie_nfo(str(nfo_filename), base_name, date)
 
 
-def generate_nfo(media_path: str, media_type: str, output_dir: str) -> None:
+def generate_nfo(
+    media_path: str, media_type: str, output_dir: str, max_workers: int | None = None
+) -> None:
     """
     Generates .nfo files for media in a given directory and subdirectories.
 
@@ -41,6 +87,8 @@ def generate_nfo(media_path: str, media_type: str, output_dir: str) -> None:
         media_path (str): Path to the media directory.
         media_type (str): Type of media (movie, tvshow, season, episode, artist, album, musicvideo).
         output_dir (str): Directory to save the generated .nfo files.
+        max_workers (int): Number of threads writing .nfo files. Defaults to
+            min(32, 4 * CPU count); use a small value such as 2 on spinning disks.
     """
 
     output_path = Path(output_dir)
@@ -48,20 +96,38 @@ def generate_nfo(media_path: str, media_type: str, output_dir: str) -> None:
     media_path_obj = Path(media_path)
 
     if media_type in ["movie", "episode", "musicvideo"]:
-        for file_path in media_path_obj.rglob("*"):  # rglob for recursive globbing
-            if file_path.is_file() and file_path.suffix.lower() in (
-                ".m4v",
-                ".mp4",
-                ".mkv",
-                ".avi",
-                ".mov",
-                ".iso",
-                ".vob",
-                ".m2ts",
-            ):
-                relative_path = file_path.relative_to(media_path_obj)
-                file_output_path = output_path / relative_path.parent
-                process_single_file(file_path, media_type, file_output_path)
+        # Files sharing a stem map to the same .nfo; only one of them is processed so
+        # two workers never write the same file.
+        jobs: dict[tuple[str, str], tuple[str, Path]] = {}
+        output_dirs: dict[str, Path] = {}
+        for entry in _iter_files(str(media_path_obj)):
+            # Split the name once and filter before building any Path. As with
+            # Path.suffix, a leading dot does not start an extension, so a dotfile
+            # such as ".mp4" has none and is skipped.
+            name = entry.name
+            dot = name.rfind(".")
+            if dot <= 0 or name[dot:].lower() not in _MEDIA_EXTS:
+                continue
+            dirpath = os.path.dirname(entry.path)
+            file_output_path = output_dirs.get(dirpath)
+            if file_output_path is None:
+                file_output_path = output_path / os.path.relpath(dirpath, media_path_obj)
+                file_output_path.mkdir(parents=True, exist_ok=True)
+                output_dirs[dirpath] = file_output_path
+            base_name = name[:dot]  # Same as Path.stem
+            jobs.setdefault((dirpath, base_name), (entry.path, file_output_path))
+
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    process_single_file, Path(path), media_type, file_output_path, base_name
+                )
+                for (_, base_name), (path, file_output_path) in jobs.items()
+            ]
+            for future in futures:
+                future.result()
     elif media_type == "tvshow":
         nfo_filename = output_path / "tvshow.nfo"
         if not nfo_filename.exists():
@@ -85,32 +151,79 @@ def generate_nfo(media_path: str, media_type: str, output_dir: str) -> None:
 def detect_date_in_name(name: str) -> str | None:
     """Detects a date in the file name and returns it in YYYY-MM-DD format.
 
+    The leftmost valid date wins; when several formats match at the same position,
+    YYYY-MM-DD is preferred over DD-MM-YYYY over YY-MM-DD. Matches whose month is
+    not 1-12 or whose day is not 1-31 are skipped.
+
     Args:
 
         name (str): The file name to search for a date.
         Returns:
             str: The detected date in YYYY-MM-DD format, or None if no date is found.
     """
-    date_patterns = [
-        r"(\d{4})[-_.](\d{2})[-_.](\d{2})",  # YYYY-MM-DD or YYYY_MM_DD or YYYY.MM.DD
-        r"(\d{2})[-_.](\d{2})[-_.](\d{4})",  # DD-MM-YYYY or DD_MM_YYYY or DD.MM.YYYY
-        r"(\d{2})[-._](\d{2})[-._](\d{2})",  # YY-MM-DD or YY_MM_DD or YY.MM.DD
-    ]
-    for pattern in date_patterns:
-        match = re.search(pattern, name)
-        if match:
-            if len(match.groups()) == 3:
-                year, month, day = match.groups()
-                if len(year) == 4:
-                    return f"{year}-{month}-{day}"
-                elif len(day) == 4:
-                    return f"{day}-{month}-{year}"
-                elif len(year) == 2:
-                    year = "20" + year if int(year) < 25 else "19" + year
-                    return f"{year}-{month}-{day}"
+    for match in _DATE_RE.finditer(name):
+        if match["y4"] is not None:
+            year, month, day = match["y4"], match["m1"], match["d1"]
+        elif match["y4b"] is not None:
+            year, month, day = match["y4b"], match["m2"], match["d2"]
+        else:
+            year, month, day = match["y2"], match["m3"], match["d3"]
+            year = "20" + year if int(year) < 25 else "19" + year
+        if 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
+            return f"{year}-{month}-{day}"
     return None
 
 
+def _parse(nfo_filename: str):
+    """Parses an existing .nfo file.
+
+    With lxml installed, the C parser is used and ignorable whitespace is dropped
+    so the rewritten file stays compact. A parser is created per call because
+    lxml parsers must not be shared between threads.
+
+    Args:
+        nfo_filename (str): Path to the .nfo file to parse.
+    """
+    if _HAVE_LXML:
+        return ET.parse(nfo_filename, ET.XMLParser(remove_blank_text=True))
+    return ET.parse(nfo_filename)
+
+
+def _write_tree(tree, nfo_filename: str) -> None:
+    """Writes a parsed .nfo tree back to disk.
+
+    The tree is serialized into memory first and written with a single call,
+    instead of ElementTree streaming many small writes into the file.
+
+    Args:
+        tree (ElementTree): Tree to serialize.
+        nfo_filename (str): Path to the .nfo file to write.
+    """
+    buf = io.BytesIO()
+    tree.write(buf, encoding="utf-8", xml_declaration=True)
+    Path(nfo_filename).write_bytes(buf.getvalue())
+
+
+def _write_simple_nfo(nfo_filename: str, root_tag: str, fields: list[tuple[str, str]]) -> None:
+    """Writes a flat .nfo file directly from a template.
+
+    The freshly created .nfo files only hold a handful of text elements, so they
+    are formatted as a string instead of being built and serialized with ElementTree.
+    The output matches what ``ElementTree.write`` produces for the same tree.
+
+    Args:
+        nfo_filename (str): Path to the .nfo file to create.
+        root_tag (str): Tag of the root element.
+        fields (list[tuple[str, str]]): (tag, text) pairs for the child elements.
+    """
+    body = "".join(f"<{tag}>{escape(text)}</{tag}>" for tag, text in fields)
+    Path(nfo_filename).write_text(
+        f"<?xml version='1.0' encoding='utf-8'?>\n<{root_tag}>{body}</{root_tag}>",
+        encoding="utf-8",
+        errors="xmlcharrefreplace",
+    )
+
+
 def create_movie_nfo(nfo_filename: str, title: str, date: str | None = None) -> None:
     """Creates a basic movie .nfo file.
 
@@ -120,16 +233,10 @@ def create_movie_nfo(nfo_filename: str, title: str, date: str | None = None) ->
         title (str): Title of the movie.
         date (str): Release date of the movie in YYYY-MM-DD format.
     """
-    root = ET.Element("movie")
-    title_elem = ET.SubElement(root, "title")
-    title_elem.text = title
+    fields = [("title", title)]
     if date:
-        premiered_elem = ET.SubElement(root, "premiered")
-        premiered_elem.text = date
-        releasedate_elem = ET.SubElement(root, "releasedate")
-        releasedate_elem.text = date
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+        fields += [("premiered", date), ("releasedate", date)]
+    _write_simple_nfo(nfo_filename, "movie", fields)
 
 
 def update_movie_nfo(nfo_filename: str, title: str, date: str | None = None) -> None:
@@ -141,7 +248,7 @@ def update_movie_nfo(nfo_filename: str, title: str, date: str | None = None) ->
         title (str): Title of the movie.
         date (str): Release date of the movie in YYYY-MM-DD format.
     """
-    tree = ET.parse(nfo_filename)
+    tree = _parse(nfo_filename)
     root = tree.getroot()
     title_elem = root.find("title")
     if title_elem is None:
@@ -156,7 +263,7 @@ def update_movie_nfo(nfo_filename: str, title: str, date: str | None = None) ->
         if releasedate_elem is None:
             releasedate_elem = ET.SubElement(root, "releasedate")
         releasedate_elem.text = date
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_tree(tree, nfo_filename)
 
 
 def create_tvshow_nfo(nfo_filename: str) -> None:
@@ -166,11 +273,7 @@ def create_tvshow_nfo(nfo_filename: str) -> None:
     
         nfo_filename (str): Path to the .nfo file to create.
     """
-    root = ET.Element("tvshow")
-    title_elem = ET.SubElement(root, "title")
-    title_elem.text = "TV Show Title"
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_simple_nfo(nfo_filename, "tvshow", [("title", "TV Show Title")])
 
 
 def create_season_nfo(nfo_filename: str) -> None:
@@ -180,11 +283,7 @@ def create_season_nfo(nfo_filename: str) -> None:
     
         nfo_filename (str): Path to the .nfo file to create.
     """
-    root = ET.Element("season")
-    title_elem = ET.SubElement(root, "title")
-    title_elem.text = "Season Title"
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_simple_nfo(nfo_filename, "season", [("title", "Season Title")])
 
 
 def create_episode_nfo(nfo_filename: str, title: str, date: str | None = None) -> None:
@@ -194,16 +293,10 @@ def create_episode_nfo(nfo_filename: str, title: str, date: str | None = None) -
         title (str): Title of the episode.
         date (str): Release date of the episode in YYYY-MM-DD format.
     """
-    root = ET.Element("episodedetails")
-    title_elem = ET.SubElement(root, "title")
-    title_elem.text = title
+    fields = [("title", title)]
     if date:
-        premiered_elem = ET.SubElement(root, "premiered")
-        premiered_elem.text = date
-        releasedate_elem = ET.SubElement(root, "releasedate")
-        releasedate_elem.text = date
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+        fields += [("premiered", date), ("releasedate", date)]
+    _write_simple_nfo(nfo_filename, "episodedetails", fields)
 
 
 def update_episode_nfo(nfo_filename: str, title: str, date: str | None = None) -> None:
@@ -213,7 +306,7 @@ def update_episode_nfo(nfo_filename: str, title: str, date: str | None = None) -
         title (str): Title of the episode.
         date (str): Release date of the episode in YYYY-MM-DD format.
     """
-    tree = ET.parse(nfo_filename)
+    tree = _parse(nfo_filename)
     root = tree.getroot()
     title_elem = root.find("title")
     if title_elem is None:
@@ -228,7 +321,7 @@ def update_episode_nfo(nfo_filename: str, title: str, date: str | None = None) -
         if releasedate_elem is None:
             releasedate_elem = ET.SubElement(root, "releasedate")
         releasedate_elem.text = date
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_tree(tree, nfo_filename)
 
 
 def create_artist_nfo(nfo_filename: str) -> None:
@@ -236,11 +329,7 @@ def create_artist_nfo(nfo_filename: str) -> None:
     Args:
         nfo_filename (str): Path to the .nfo file to create.
     """
-    root = ET.Element("artist")
-    name_elem = ET.SubElement(root, "name")
-    name_elem.text = "Artist Name"
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_simple_nfo(nfo_filename, "artist", [("name", "Artist Name")])
 
 
 def create_album_nfo(nfo_filename: str) -> None:
@@ -248,11 +337,164 @@ def create_album_nfo(nfo_filename: str) -> None:
     Args:
         nfo_filename (str): Path to the .nfo file to create.
     """
-    root = ET.Element("album")
-    title_elem = ET.SubElement(root, "title")
-    title_elem.text = "Album Title"
-    tree = ET.ElementTree(root)
-    tree.write(nfo_filename, encoding="utf-8", xml_declaration=True)
+    _write_simple_nfo(nfo_filename, "album", [("title", "Album Title")])
+
+
+def _apply_attribute(
+    root: ET.Element,
+    attribute: str,
+    value: str,
+    role: None | str = None,
+    type_actor: str = "Actor",
+    thumb: str | None = None,
+) -> bool:
+    """Adds a single attribute to a parsed .nfo root element.
+
+    Args:
+        root (Element): Root element of the parsed .nfo file.
+        attribute (str): Attribute to add (e.g., studio, actor, year).
+        value (str): Value of the attribute.
+        role (str): Role of the actor.
+        type_actor (str): Type of actor.
+        thumb (str): Path to the actor's thumbnail.
+
+    Returns:
+        bool: True if the tree was modified.
+    """
+    if attribute == "actor":
+        # Find all existing actors in the XML
+        existing_actors = {name_elem.text for name_elem in root.iterfind("actor/name")}
+        if value not in existing_actors:
+            actor_elem = ET.SubElement(root, "actor")
+            name_elem = ET.SubElement(actor_elem, "name")
+            name_elem.text = value
+            if role:
+                role_elem = ET.SubElement(actor_elem, "role")
+                role_elem.text = role
+            if type_actor:
+                type_elem = ET.SubElement(actor_elem, "type")
+                type_elem.text = type_actor
+            if thumb:
+                thumb_elem = ET.SubElement(actor_elem, "thumb")
+                thumb_elem.text = thumb
+            return True
+
+    elif attribute == "year":
+        if root.find("year") is None:
+            year_elem = ET.SubElement(root, "year")
+            year_elem.text = value
+            return True
+    elif value in {elem.text for elem in root.iterfind(attribute)}:
+        # If the attribute already exists with this value, skip adding it
+        return False
+    else:
+        # For other attributes, just add the element
+        new_elem = ET.SubElement(root, attribute)
+        new_elem.text = value
+        return True
+    return False
+
+
+def _has_all(nfo_path: str, ops: list[tuple]) -> bool:
+    """Checks with a streaming parse whether every operation is already applied.
+
+    Mirrors the checks in _apply_attribute: any year counts, actors are matched by
+    name, other attributes by value. Parsing stops as soon as everything is found,
+    and finished elements are cleared so large cast lists are never held in memory.
+
+    Args:
+        nfo_path (str): Path to the .nfo file.
+        ops (list[tuple]): Operations as accepted by batch_add_attributes.
+
+    Returns:
+        bool: True if applying ops would leave the file unchanged.
+    """
+    pending = set()
+    for attribute, value, *_ in ops:
+        if attribute == "year":
+            pending.add(("year", None))
+        elif attribute == "actor":
+            pending.add(("actor/name", value))
+        else:
+            pending.add((attribute, value))
+    tags = []
+    try:
+        for event, elem in ET.iterparse(nfo_path, events=("start", "end")):
+            if event == "start":
+                tags.append(elem.tag)
+                continue
+            depth = len(tags)
+            if depth == 2:  # Child of the root element
+                pending.discard(("year", None) if elem.tag == "year" else (elem.tag, elem.text))
+                elem.clear()
+            elif depth == 3 and tags[1] == "actor" and elem.tag == "name":
+                pending.discard(("actor/name", elem.text))
+            tags.pop()
+            if not pending:
+                return True
+    except _ParseError:
+        pass  # Reported by the full parse
+    return False
+
+
+def _process_one_nfo(job: tuple[str, list[tuple]]) -> str | None:
+    """Applies attribute operations to one .nfo file (process pool worker).
+
+    Args:
+        job (tuple): ``(nfo_path, ops)`` with ops as accepted by batch_add_attributes.
+
+    Returns:
+        str | None: An error message if the file could not be read, parsed or written,
+        otherwise None.
+    """
+    nfo_path, ops = job
+    try:
+        if os.path.getsize(nfo_path) >= _PRESCAN_SIZE and _has_all(nfo_path, ops):
+            return None
+        tree = _parse(nfo_path)
+        root = tree.getroot()
+        modified = False
+        for attribute, value, *options in ops:
+            modified |= _apply_attribute(root, attribute, value, **(options[0] if options else {}))
+        if modified:  # Leave files that already had everything untouched
+            _write_tree(tree, nfo_path)
+    except _ParseError:
+        return f"Error parsing {os.path.basename(nfo_path)}. Skipping."
+    except OSError as e:  # Removed or unreadable since it was listed
+        return f"Error processing {os.path.basename(nfo_path)}: {e}. Skipping."
+    return None
+
+
+def batch_add_attributes(nfo_dir: str, ops: list[tuple], max_workers: int | None = None) -> None:
+    """
+    Batch adds several attributes to existing .nfo files in a single pass.
+
+    Each .nfo file is parsed and written once, no matter how many attributes are added.
+    Files are independent, so they are spread over a process pool.
+
+    Args:
+        nfo_dir (str): Directory containing .nfo files.
+        ops (list[tuple]): ``(attribute, value)`` or ``(attribute, value, options)`` tuples,
+            where options is a dict of keyword arguments (role, type_actor, thumb)
+            as accepted by batch_add_attribute.
+        max_workers (int): Number of worker processes. Defaults to the CPU count.
+    """
+    chunksize = 32
+    jobs = [
+        (entry.path, ops)
+        for entry in _iter_files(str(nfo_dir))  # Includes subfolders
+        if entry.name.endswith(".nfo")
+    ]
+    if len(jobs) <= chunksize or max_workers == 1:
+        # Not worth starting worker processes for a single chunk.
+        for error in map(_process_one_nfo, jobs):
+            if error:
+                print(error)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for error in executor.map(_process_one_nfo, jobs, chunksize=chunksize):
+            if error:
+                print(error)
 
 
 def batch_add_attribute(
@@ -266,6 +508,8 @@ def batch_add_attribute(
     """
     Batch adds an attribute to existing .nfo files.
 
+    Use batch_add_attributes to add several attributes without re-reading every file.
+
     Args:
         nfo_dir (str): Directory containing .nfo files.
         attribute (str): Attribute to add (e.g., studio, actor, year).
@@ -274,48 +518,10 @@ def batch_add_attribute(
         type_actor (str): Type of actor.
         thumb (str): Path to the actor's thumbnail.
     """
-    nfo_path_obj = Path(nfo_dir)
-    for file_path in nfo_path_obj.rglob("*.nfo"):  # Use rglob to search in subfolders
-        try:
-            tree = ET.parse(str(file_path))
-            root = tree.getroot()
-
-            if attribute == "actor":
-                # Find all existing actors in the XML
-                existing_actors = []
-                for actor in root.findall("actor"):
-                    name_elem = actor.find("name")
-                    if name_elem is not None and name_elem.text is not None:
-                        existing_actors.append(name_elem.text)
-                if value not in existing_actors:
-                    actor_elem = ET.SubElement(root, "actor")
-                    name_elem = ET.SubElement(actor_elem, "name")
-                    name_elem.text = value
-                    if role:
-                        role_elem = ET.SubElement(actor_elem, "role")
-                        role_elem.text = role
-                    if type_actor:
-                        type_elem = ET.SubElement(actor_elem, "type")
-                        type_elem.text = type_actor
-                    if thumb:
-                        thumb_elem = ET.SubElement(actor_elem, "thumb")
-                        thumb_elem.text = thumb
-
-            elif attribute == "year":
-                if root.find("year") is None:
-                    year_elem = ET.SubElement(root, "year")
-                    year_elem.text = value
-            elif value in root.findall(attribute):
-                # If the attribute already exists, skip adding it
-                continue
-            else:
-                # For other attributes, just add the element
-                new_elem = ET.SubElement(root, attribute)
-                new_elem.text = value
-
-            tree.write(str(file_path), encoding="utf-8", xml_declaration=True)
-        except ET.ParseError:
-            print(f"Error parsing {file_path.name}. Skipping.")
+    batch_add_attributes(
+        nfo_dir,
+        [(attribute, value, {"role": role, "type_actor": type_actor, "thumb": thumb})],
+    )
 
 
 if __name__ == "__main__":
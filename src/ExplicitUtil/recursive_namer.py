@@ -1,5 +1,7 @@
+import os
 from pathlib import Path
 import subprocess
+import sys
 from typing import Union, Tuple
 import importlib.resources
 __docformat__ = "google"
@@ -37,7 +39,7 @@ def run_namer_command(
     directory: Path, namer_config: str = ".namer.cfg"
 ) -> tuple[str | None, str, int]:
     """
-    Executes a PowerShell command to process files in a directory.
+    Runs namer on a file with the current Python interpreter.
     Try fetch from jellyfin generated nfo first. If fails, try to rename using theporndb.net.
 
     Args:
@@ -47,13 +49,15 @@ def run_namer_command(
     Returns:
         tuple: A tuple containing (stdout, stderr, returncode).
     """
+    # Call the interpreter directly with an argument list: no PowerShell startup
+    # per file and no quoting problems with unusual paths.
+    base_command = [
+        sys.executable, "-m", "namer", "rename", "-c", str(namer_config), "-f", str(directory)
+    ]
     try:
         print(f"Try loading from nfo. Processing file: {directory}")
-        command = (
-            f'python -m namer rename -c "{namer_config}" -f "{str(directory)}" -i -v'
-        )
         process = subprocess.run(
-            ["powershell", "-Command", command],
+            base_command + ["-i", "-v"],
             capture_output=True,
             text=True,
             check=False,
@@ -64,18 +68,19 @@ def run_namer_command(
         print(stdout)
         # print(stderr)
         print(returncode)
-        if returncode == 0:
+        if returncode != 0:
+            # Only fall back to the PornDB when the nfo lookup failed.
             print(f"Error processing {directory} from nfo: {stderr}. Try the PornDB instead.")
-            command = (
-                f'python -m namer rename -c "{namer_config}" -f "{str(directory)}" -v'
-            )
             process = subprocess.run(
-                ["powershell", "-Command", command],
+                base_command + ["-v"],
                 capture_output=True,
                 text=True,
                 check=False,
             )
-            print(process.stdout)
+            stdout = process.stdout
+            stderr = process.stderr
+            returncode = process.returncode
+            print(stdout)
         return stdout, stderr, returncode
     except Exception as e:
         return None, str(e), -1
@@ -91,19 +96,15 @@ def get_leaf_directories(root_path: Path) -> list[Path]:
     Returns:
         list: A list of Path objects representing the leaf directories.
     """
-    leaf_dirs = []
     if not root_path.is_dir():
-        return leaf_dirs
+        return []
 
-    for item in root_path.iterdir():
-        if item.is_dir():
-            if not any(sub_item.is_dir() for sub_item in item.iterdir()):
-                # If no sub-directories are found, it's a leaf directory.
-                leaf_dirs.append(item)
-            else:
-                # Recursively check subdirectories.
-                leaf_dirs.extend(get_leaf_directories(item))
-    return leaf_dirs
+    # Single bottom-up walk; the root itself is never reported as a leaf.
+    return [
+        Path(dirpath)
+        for dirpath, dirnames, _ in os.walk(root_path, topdown=False)
+        if not dirnames and dirpath != str(root_path)
+    ]
 
 
 def process_leaf_files(root_dir: Path, namer_config: str = ".namer.cfg") -> None:
@@ -119,10 +120,10 @@ def process_leaf_files(root_dir: Path, namer_config: str = ".namer.cfg") -> None
         print(directory)
         stdout, stderr, returncode = run_namer_command(directory, namer_config)
         if returncode == 0:
-            print("PowerShell command output:")
+            print("namer output:")
             print(stdout)
         else:
-            print("PowerShell command error:")
+            print("namer error:")
             print(stderr)
             print(f"Return code: {returncode}")
 
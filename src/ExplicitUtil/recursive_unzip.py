@@ -1,7 +1,121 @@
+import os
+import shutil
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import argparse
 from pathlib import Path
 __docformat__ = "google"
+# Copy buffer used when streaming members out of an archive.
+_COPY_BUFSIZE = 1 << 20
+
+
+def _member_target(info: zipfile.ZipInfo, extract_path: Path) -> Path | None:
+    """Returns where ``ZipFile.extractall`` would write an archive member.
+
+    Absolute paths, drive letters and ``..`` components are dropped from the
+    member name, and on Windows illegal characters are replaced and trailing
+    dots and spaces stripped, the same way ``ZipFile.extractall`` does.
+
+    Args:
+        info (ZipInfo): The member to extract.
+        extract_path (Path): The directory to extract into.
+
+    Returns:
+        Path | None: The target path, or None if nothing is left of the name.
+    """
+    arcname = info.filename.replace("/", os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.sep.join(
+        part for part in arcname.split(os.sep) if part not in ("", os.curdir, os.pardir)
+    )
+    if os.sep == "\\":
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.sep)
+    if not arcname:
+        return None
+    return extract_path / arcname
+
+
+def _extract_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path) -> None:
+    """Extracts a single archive member using a large copy buffer.
+
+    Args:
+        zip_ref (ZipFile): The open archive.
+        info (ZipInfo): The member to extract.
+        target (Path): Where to write it, from _member_target.
+    """
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zip_ref.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+
+
+def _extract_members(zip_path: Path, members: list[tuple[zipfile.ZipInfo, Path]]) -> None:
+    """Extracts a subset of an archive's members through a private ZipFile handle.
+
+    ZipFile objects are not safe to read from several threads, so every worker
+    thread opens the archive on its own.
+
+    Args:
+        zip_path (Path): The archive to read.
+        members (list[tuple[ZipInfo, Path]]): The members to extract and their targets.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info, target in members:
+            _extract_member(zip_ref, info, target)
+
+
+def _extract_one(zip_path: Path, delete_zips: bool = False, member_workers: int = 1) -> None:
+    """Extracts a single ZIP archive next to itself.
+
+    Args:
+        zip_path (Path): The archive to extract.
+        delete_zips (bool, optional): Whether to delete the archive after unzipping. Defaults to False.
+        member_workers (int, optional): Number of threads inflating members of this archive. Defaults to 1.
+    """
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            infos = zip_ref.infolist()
+        # Create a folder with the same name as the ZIP file (without the .zip extension)
+        extract_path = zip_path.parents[0]
+
+        # Zip allows several entries with the same name. As with a serial extractall
+        # the last one wins, and only it is written, so no two threads share a file.
+        latest = {}
+        for info in infos:
+            target = _member_target(info, extract_path)
+            if target is not None:
+                latest[os.path.normcase(target)] = (info, target)
+        members = list(latest.values())
+
+        workers = min(member_workers, len(members))
+        if workers <= 1:
+            _extract_members(zip_path, members)
+        else:
+            # zlib releases the GIL while inflating, so threads decompress in parallel.
+            # Deal the largest members out first to balance the shares.
+            members.sort(key=lambda member: member[0].file_size, reverse=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(
+                    executor.map(
+                        _extract_members,
+                        [zip_path] * workers,
+                        [members[i::workers] for i in range(workers)],
+                    )
+                )
+        print(f"Unzipped: {zip_path} to {extract_path}")
+
+        if delete_zips:
+            zip_path.unlink()
+            print(f"Deleted: {zip_path}")
+    except zipfile.BadZipFile:
+        print(f"Error: {zip_path} is not a valid ZIP file.")
+    except Exception as e:
+        print(f"An error occurred while processing {zip_path}: {e}")
+
 
 def recursive_unzip(folder_path: Path | str, delete_zips: bool = False) -> None:
     """
@@ -18,22 +132,24 @@ def recursive_unzip(folder_path: Path | str, delete_zips: bool = False) -> None:
         return
     folder = Path(folder_path)
 
-    for zip_path in folder.glob("**/*.zip"):
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                # Create a folder with the same name as the ZIP file (without the .zip extension)
-                extract_path = zip_path.parents[0]
-
-                zip_ref.extractall(extract_path)
-            print(f"Unzipped: {zip_path} to {extract_path}")
-
-            if delete_zips:
-                zip_path.unlink()
-                print(f"Deleted: {zip_path}")
-        except zipfile.BadZipFile:
-            print(f"Error: {zip_path} is not a valid ZIP file.")
-        except Exception as e:
-            print(f"An error occurred while processing {zip_path}: {e}")
+    zips = list(folder.glob("**/*.zip"))
+    if not zips:
+        return
+
+    # Archives are independent, so inflate them in parallel worker processes. Cores not
+    # needed for one process per archive go to member-level threads inside each archive.
+    cpu_count = os.cpu_count() or 1
+    archive_workers = min(len(zips), cpu_count)
+    member_workers = max(1, cpu_count // archive_workers)
+    with ProcessPoolExecutor(max_workers=archive_workers) as executor:
+        list(
+            executor.map(
+                _extract_one,
+                zips,
+                [delete_zips] * len(zips),
+                [member_workers] * len(zips),
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -2,6 +2,85 @@ import os
 import logging
 __docformat__ = "google"
 
+
+def _scan_dir(path: str) -> list | None:
+    """
+    Lists a directory once with os.scandir for _remove_empty.
+
+    Args:
+        path (str): Directory to list
+
+    Returns:
+        list | None: A ``[path, subdirs, next_index, empty]`` stack frame, where empty
+        starts out as "holds no files", or None if the directory could not be listed
+    """
+    subdirs = []
+    has_other = False
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    has_other = True
+    except OSError as e:
+        print(f"Failed to scan directory '{path}': {e}")
+        return None
+    return [path, subdirs, 0, not has_other]
+
+
+def _remove_empty(path: str, dry_run: bool, removed: list[str]) -> bool:
+    """
+    Depth-first helper that removes the empty directories below path.
+
+    Each directory is listed once with os.scandir; it counts as empty when it holds
+    nothing but subdirectories that were removed (or would be, in a dry run). The
+    walk keeps an explicit stack, so deep trees do not hit the recursion limit.
+
+    Args:
+        path (str): Directory to clean
+        dry_run (bool): If True, only report what would be removed
+        removed (list[str]): Collects the directories removed (or that would be removed)
+
+    Returns:
+        bool: True if path is now empty (or would be, in a dry run)
+    """
+    root = _scan_dir(path)
+    if root is None:
+        return False
+    stack = [root]
+    while True:
+        frame = stack[-1]
+        subdirs, index = frame[1], frame[2]
+        if index < len(subdirs):  # Descend into the next subdirectory
+            frame[2] += 1
+            child = _scan_dir(subdirs[index])
+            if child is None:
+                frame[3] = False
+            else:
+                stack.append(child)
+            continue
+        stack.pop()
+        if not stack:
+            return frame[3]
+        parent = stack[-1]
+        subdir, empty = frame[0], frame[3]
+        if not empty:
+            parent[3] = False
+            continue
+        if dry_run:
+            print(f"Would remove empty directory: {subdir}")
+            removed.append(subdir)
+            continue
+        try:
+            os.rmdir(subdir)
+            print(f"Removed empty directory: {subdir}")
+            removed.append(subdir)
+        except OSError as e:
+            print(f"Failed to remove directory '{subdir}': {e}")
+            parent[3] = False
+
+
 def remove_empty_folders(root_dir:str, dry_run:bool=False) -> int:
     """
     Recursively removes empty folders starting from the deepest level
@@ -11,7 +90,7 @@ def remove_empty_folders(root_dir:str, dry_run:bool=False) -> int:
         dry_run (bool): If True, only report what would be removed without actually removing
     
     Returns:
-        int: Number of directories removed
+        int: Number of directories removed (or that would be removed in a dry run)
     """
     if not os.path.isdir(root_dir):
         print(f"'{root_dir}' is not a valid directory")
@@ -19,24 +98,12 @@ def remove_empty_folders(root_dir:str, dry_run:bool=False) -> int:
     
     print(f"Scanning for empty directories in: {root_dir}")
     
-    count = 0
-    # Walk bottom-up so we handle the deepest directories first
-    for dirpath, dirnames, filenames in os.walk(root_dir, topdown=False):
-        # Skip the root directory itself
-        if dirpath == root_dir:
-            continue
-        
-        # Check if this directory is empty (no files and no non-empty subdirectories)
-        if not filenames and not dirnames:
-            if dry_run:
-                print(f"Would remove empty directory: {dirpath}")
-            else:
-                try:
-                    os.rmdir(dirpath)
-                    print(f"Removed empty directory: {dirpath}")
-                    count += 1
-                except OSError as e:
-                    print(f"Failed to remove directory '{dirpath}': {e}")
+    # Depth-first, so the deepest directories are handled first and parents that
+    # only contained empty directories are caught in the same pass. The root
+    # directory itself is never removed.
+    removed = []
+    _remove_empty(root_dir, dry_run, removed)
+    count = len(removed)
     
     action = "Would remove" if dry_run else "Removed"
     print(f"{action} {count} empty directories")
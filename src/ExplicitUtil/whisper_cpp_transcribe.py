@@ -1,14 +1,26 @@
+import codecs
+import functools
+import os
+import select
 import subprocess
 from pathlib import Path
 import threading
+import time
 import queue
 import concurrent.futures
+from dataclasses import dataclass
 import sys
 import importlib.resources
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+import tomli_w
+if sys.platform == "linux":
+    import fcntl
 __docformat__ = "google"
-# Global whisper job queue
-whisper_queue = queue.Queue()
+# Overwrite outputs and only report errors: no banner and no per-second stats lines.
+_FFMPEG_BASE = ("ffmpeg", "-y", "-hide_banner", "-nostats", "-loglevel", "error")
 
 
 def get_input_folder() -> tuple[Path, Path]:
@@ -28,63 +40,309 @@ def get_input_folder() -> tuple[Path, Path]:
         )
 
 
-def extract_audio(video_file: Path, whisper_root: Path, prompt: str = "") -> None:
-    """Extract audio using FFmpeg concurrently.
-    If successful, put the whisper job into the whisper_queue for sequential processing.
+def _wait_event_driven(process: subprocess.Popen) -> int:
+    """Wait for a subprocess without polling.
+    On Linux a pidfd becomes readable when the process exits, so the thread sleeps
+    in select() until then. Elsewhere this falls back to Popen.wait().
+    Args:
+        process (subprocess.Popen): Process to wait for.
+    Returns:
+        int: The process return code.
     """
-    input_folder = video_file.parent
-    base_name = video_file.stem
-    audio_file = input_folder / f"{base_name}.wav"
-    whisper_path = whisper_root / "build/bin/Release/whisper-cli.exe"
-    model_path = whisper_root / "models/ggml-large-v3.bin"
+    if hasattr(os, "pidfd_open") and process.returncode is None:
+        try:
+            fd = os.pidfd_open(process.pid)
+        except OSError:
+            pass  # Already reaped or pidfd unsupported by the kernel
+        else:
+            try:
+                select.select([fd], [], [])
+            finally:
+                os.close(fd)
+    return process.wait()
 
-    print(f"[FFmpeg] Processing: {video_file}")
 
-    ffmpeg_cmd = [
-        "ffmpeg",
-        "-y",
+def _widen_pipe(pipe, size: int = 1 << 20) -> None:
+    """Grow a subprocess pipe's kernel buffer so the child stalls less on writes.
+    Only Linux supports resizing pipes; elsewhere this is a no-op.
+    Args:
+        pipe: File object wrapping the pipe (e.g. Popen.stdout).
+        size (int): Requested buffer size in bytes.
+    """
+    if sys.platform != "linux" or pipe is None:
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, size)
+    except (OSError, AttributeError):
+        pass  # Above /proc/sys/fs/pipe-max-size, or an older Python
+
+
+def _default_threads() -> int:
+    """Pick a whisper-cli thread count matching the number of physical cores.
+    Uses psutil when it is installed, otherwise assumes two hardware threads per core.
+    """
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except ImportError:
+        physical = None
+    return max(1, physical or (os.cpu_count() or 4) // 2)
+
+
+@functools.lru_cache(maxsize=None)
+def _whisper_help(whisper_path: str) -> str:
+    """Return whisper-cli's --help text, probed once per executable.
+    Args:
+        whisper_path (str): Path to the whisper-cli executable.
+    """
+    try:
+        result = subprocess.run(
+            [whisper_path, "--help"], stdin=subprocess.DEVNULL, capture_output=True, text=True, errors="replace", timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout + result.stderr
+
+
+def _iter_video_files(root: str, exts: tuple[str, ...]):
+    """Recursively yield files under root whose lowercased extension is one of exts.
+    As with Path.suffix, a leading dot does not start an extension, so a dotfile
+    such as ".mp4" is skipped.
+    Args:
+        root (str): Directory to walk.
+        exts (tuple[str]): Lowercased extensions including the dot.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_video_files(entry.path, exts)
+            elif entry.is_file(follow_symlinks=False):
+                name = entry.name
+                dot = name.rfind(".")
+                if dot > 0 and name[dot:].lower() in exts:
+                    yield Path(entry.path)
+
+
+def _is_transcribed(video_file: Path) -> bool:
+    """Check whether the video already has a subtitle file at least as new as itself.
+    Args:
+        video_file (Path): Video to check.
+    """
+    try:
+        return video_file.with_suffix(".srt").stat().st_mtime >= video_file.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _ffmpeg_command(
+    video_file: Path, output: str, audio_filter: str = "highpass=200,lowpass=3000"
+) -> list[str]:
+    """Build the FFmpeg command that converts a video's audio track to 16 kHz PCM WAV.
+    Args:
+        video_file (Path): Input video file.
+        output (str): Output audio file, or "pipe:1" to stream the WAV to stdout.
+        audio_filter (str): FFmpeg audio filter graph, empty for none.
+    """
+    return [
+        *_FFMPEG_BASE,
         "-i",
         str(video_file),  # input video file, overwrite if exists
-        "-af",
-        "highpass=200,lowpass=3000,afftdn,dialoguenhance",  # audio filters, voice enhancement
+        *_ffmpeg_output_args(audio_filter),
+        output,  # output audio file
+    ]
+
+
+def _ffmpeg_output_args(audio_filter: str) -> list[str]:
+    """FFmpeg output options producing the 16 kHz mono PCM WAV whisper expects.
+    Args:
+        audio_filter (str): FFmpeg audio filter graph, empty for none.
+    """
+    af = ["-af", audio_filter] if audio_filter else []  # audio filters, voice enhancement
+    return [
+        *af,
         "-ar",
         "16000",
         "-ac",
-        "2",
+        "1",  # whisper works on mono 16 kHz audio
         "-c:a",
         "pcm_s16le",
-        str(audio_file),  # output audio file
+        "-f",
+        "wav",
     ]
+
+
+@dataclass(slots=True)
+class WhisperJob:
+    """A video waiting for transcription.
+    Args:
+        video_file (Path): Video being transcribed.
+        audio_file (Path or None): Extracted WAV file, or None to pipe FFmpeg output into whisper-cli.
+        input_folder (Path): Folder the subtitles are written to.
+        base_name (str): Output file name without extension.
+        whisper_path (Path): whisper-cli executable.
+        model_path (Path): ggml model file.
+        prompt (str): Prompt for Whisper transcription.
+        audio_filter (str): FFmpeg audio filter graph used when piping.
+    """
+    video_file: Path
+    audio_file: Path | None
+    input_folder: Path
+    base_name: str
+    whisper_path: Path
+    model_path: Path
+    prompt: str
+    audio_filter: str
+
+
+def _has_audio(audio_file: Path) -> bool:
+    """Check that FFmpeg actually wrote a non-empty WAV file."""
+    try:
+        return audio_file.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _make_job(
+    video_file: Path,
+    whisper_path: Path,
+    model_path: Path,
+    prompt: str,
+    audio_file: Path | None,
+    audio_filter: str = "highpass=200,lowpass=3000",
+) -> WhisperJob:
+    """Build a whisper job for the job queue.
+    Args:
+        video_file (Path): Video being transcribed.
+        whisper_path (Path): whisper-cli executable.
+        model_path (Path): ggml model file.
+        prompt (str): Prompt for Whisper transcription.
+        audio_file (Path or None): Extracted WAV file, or None to pipe FFmpeg output into whisper-cli.
+        audio_filter (str): FFmpeg audio filter graph used when piping.
+    """
+    return WhisperJob(
+        video_file=video_file,
+        audio_file=audio_file,
+        input_folder=video_file.parent,
+        base_name=video_file.stem,
+        whisper_path=whisper_path,
+        model_path=model_path,
+        prompt=prompt,
+        audio_filter=audio_filter,
+    )
+
+
+def extract_audio(
+    job_queue: queue.Queue,
+    video_file: Path,
+    whisper_path: Path,
+    model_path: Path,
+    prompt: str = "",
+    audio_filter: str = "highpass=200,lowpass=3000",
+) -> None:
+    """Extract audio using FFmpeg concurrently.
+    If successful, put the whisper job into job_queue for sequential processing.
+    Args:
+        job_queue (queue.Queue): Queue feeding the whisper workers.
+        video_file (Path): Video to extract the audio from.
+        whisper_path (Path): whisper-cli executable.
+        model_path (Path): ggml model file.
+        prompt (str): Prompt for Whisper transcription.
+        audio_filter (str): FFmpeg audio filter graph, empty for none.
+    """
+    audio_file = video_file.parent / f"{video_file.stem}.wav"
+
+    print(f"[FFmpeg] Processing: {video_file}")
+
+    ffmpeg_cmd = _ffmpeg_command(video_file, str(audio_file), audio_filter)
     print(f"[FFmpeg] Running command: {' '.join(ffmpeg_cmd)}")
     try:
-        subprocess.run(ffmpeg_cmd, text=True, capture_output=True)
+        # FFmpeg writes the WAV itself; only stderr is kept for error reporting.
+        subprocess.run(
+            ffmpeg_cmd, text=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True
+        )
         print(f"[FFmpeg] Audio extraction completed for {video_file}.")
-        # print(process.stdout)
     except subprocess.CalledProcessError as e:
         print(f"[FFmpeg] Error processing {video_file}: {e.stderr}")
+        audio_file.unlink(missing_ok=True)  # Drop any partial output
+        return
+    if not _has_audio(audio_file):
+        print(f"[FFmpeg] No audio extracted from {video_file}, skipping.")
+        audio_file.unlink(missing_ok=True)
         return
 
     # When ffmpeg extraction is successful, push a whisper job to the queue.
-    job = {
-        "video_file": video_file,
-        "audio_file": audio_file,
-        "input_folder": input_folder,
-        "base_name": base_name,
-        "whisper_path": whisper_path,
-        "model_path": model_path,
-        "prompt": prompt,
-    }
-    whisper_queue.put(job)
+    job = _make_job(video_file, whisper_path, model_path, prompt, audio_file, audio_filter)
+    job_queue.put(job)
     print(f"[FFmpeg] Extraction completed for {video_file}. Whisper job queued.")
 
 
-def whisper_worker() -> None:
-    """Continuously process whisper jobs sequentially."""
+def extract_audio_batch(
+    job_queue: queue.Queue,
+    video_files: list[Path],
+    whisper_path: Path,
+    model_path: Path,
+    prompt: str = "",
+    audio_filter: str = "highpass=200,lowpass=3000",
+) -> None:
+    """Extract audio from several videos with a single FFmpeg process.
+    Every video is an input and gets its own mapped WAV output, so process startup
+    is paid once per batch. If FFmpeg fails (e.g. one input has no audio stream),
+    the batch falls back to extract_audio for each video.
+    Args:
+        job_queue (queue.Queue): Queue feeding the whisper workers.
+        video_files (list[Path]): Videos to extract the audio from.
+        whisper_path (Path): whisper-cli executable.
+        model_path (Path): ggml model file.
+        prompt (str): Prompt for Whisper transcription.
+        audio_filter (str): FFmpeg audio filter graph, empty for none.
+    """
+    if len(video_files) == 1:
+        extract_audio(job_queue, video_files[0], whisper_path, model_path, prompt, audio_filter)
+        return
+    audio_files = [v.parent / f"{v.stem}.wav" for v in video_files]
+    ffmpeg_cmd = list(_FFMPEG_BASE)
+    for video_file in video_files:
+        ffmpeg_cmd += ["-i", str(video_file)]
+    output_args = _ffmpeg_output_args(audio_filter)
+    for index, audio_file in enumerate(audio_files):
+        ffmpeg_cmd += ["-map", f"{index}:a:0", *output_args, str(audio_file)]
+
+    print(f"[FFmpeg] Processing batch of {len(video_files)}: {', '.join(map(str, video_files))}")
+    result = subprocess.run(ffmpeg_cmd, text=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        reason = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}"
+        print(f"[FFmpeg] Batch failed ({reason}), extracting one by one.")
+        for video_file in video_files:
+            extract_audio(job_queue, video_file, whisper_path, model_path, prompt, audio_filter)
+        return
+
+    for video_file, audio_file in zip(video_files, audio_files):
+        if not _has_audio(audio_file):
+            print(f"[FFmpeg] No audio extracted from {video_file}, skipping.")
+            audio_file.unlink(missing_ok=True)
+            continue
+        job_queue.put(_make_job(video_file, whisper_path, model_path, prompt, audio_file, audio_filter))
+        print(f"[FFmpeg] Extraction completed for {video_file}. Whisper job queued.")
+
+
+@functools.lru_cache(maxsize=4)
+def _read_whisper_command(config_path: str, mtime_ns: int) -> dict:
+    """Parse a whisper command config; cached until the file's modification time changes."""
+    with open(config_path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _load_whisper_command() -> dict:
+    """Load the whisper-cli options from config/whisper_command.toml, creating it with defaults if missing."""
     config_path = str(importlib.resources.files('ExplicitUtil').joinpath('config/whisper_command.toml'))
-    if not Path(config_path).exists():
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    if mtime_ns is None:
         print(f"Error: Whisper.cpp command config '{config_path}' not found. Generate default config.")
         command = {
-            "threads" : 4,
+            "threads" : 0,  # 0 = one thread per physical core
             "max_context" : 0,
             "translate" : True,
             "logprob_thold" : -0.5,
@@ -94,105 +352,184 @@ def whisper_worker() -> None:
             "language" : "auto",
             "entropy-thold" : 2.8,
             "output_format" : "-osrt",
+            "no_gpu" : False,
+            "device" : 0,
+            # File in whisper.cpp's models folder, e.g. a quantized "ggml-large-v3-q5_0.bin"
+            "model" : "ggml-large-v3.bin",
+            "flash_attn" : False,
         }
-        with open(config_path, 'w') as f:
-            f.write(toml.dumps(command))
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        with open(config_path, 'wb') as f:
+            tomli_w.dump(command, f)
     else:
-        with open(config_path, 'r') as f:
-            command = toml.load(f)
-    while True:
-        job = whisper_queue.get()
+        # Copied so callers cannot modify the cached dict.
+        command = dict(_read_whisper_command(config_path, mtime_ns))
+    return command
+
+
+def _whisper_options(command: dict, threads: int) -> list[str]:
+    """Build the whisper-cli options that come from the command config.
+    Args:
+        command (dict): whisper-cli options, as loaded by _load_whisper_command.
+        threads (int): Value passed to --threads.
+    Raises:
+        KeyError: If the config lacks a required option.
+    """
+    return [
+        "--threads",
+        str(threads),
+        "--max-context",
+        str(command["max_context"]),
+        "--translate",
+        str(command["translate"]),
+        "--logprob-thold",
+        str(command["logprob_thold"]),
+        "--no-speech-thold",
+        str(command["no_speech_thold"]),
+        "--word-thold",
+        str(command["word_thold"]),
+        "--best-of",
+        str(command["best_of"]),
+        "--language",
+        str(command["language"]),
+        "--entropy-thold",
+        str(command["entropy-thold"]),
+        str(command["output_format"]),
+    ]
+
+
+def whisper_worker(
+    job_queue: queue.Queue,
+    batch_size: int = 1,
+    workers: int = 1,
+    command: dict | None = None,
+    batch_timeout: float = 1.0,
+) -> None:
+    """Continuously process whisper jobs sequentially.
+    Jobs are grouped, up to batch_size at a time, into a single whisper-cli
+    invocation so the model is loaded once per batch rather than once per file.
+    Piped jobs always run one at a time.
+    Args:
+        job_queue (queue.Queue): Queue of WhisperJob items; None stops the worker.
+        batch_size (int): Maximum number of files passed to one whisper-cli call.
+        workers (int): Number of workers running concurrently; automatic thread
+            counts are divided between them.
+        command (dict, optional): whisper-cli options; loaded from the config file if omitted.
+        batch_timeout (float): Seconds to wait after the first job of a batch for
+            FFmpeg to deliver more, so the batch is not cut short by a slow extraction.
+    """
+    if command is None:
+        command = _load_whisper_command()
+    threads = command.get("threads") or max(1, _default_threads() // workers)
+    stop = False
+    while not stop:
+        job = job_queue.get()
         if job is None:  # Sentinel to shutdown the worker
             break
+        jobs = [job]
+        deadline = time.monotonic() + batch_timeout
+        # Only files on disk can share an invocation; stdin carries a single stream.
+        while job.audio_file is not None and len(jobs) < batch_size:
+            try:
+                job = job_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if job is None:
+                stop = True  # Finish this batch, then shut down
+                break
+            jobs.append(job)
 
-        video_file = job["video_file"]
-        audio_file = job["audio_file"]
-        input_folder = job["input_folder"]
-        base_name = job["base_name"]
-        whisper_path = job["whisper_path"]
-        model_path = job["model_path"]
-        prompt = job["prompt"]
+        video_file = ", ".join(str(job.video_file) for job in jobs)
+        audio_file = jobs[0].audio_file
+        base_name = ", ".join(job.base_name for job in jobs)
+        whisper_path = jobs[0].whisper_path
+        model_path = jobs[0].model_path
+        prompt = jobs[0].prompt
 
         cli_encoding = 'utf-8'
         print(f"[Whisper] Processing: {video_file}")
 
-        whisper_cmd = [
-            str(whisper_path),
-            "-m",
-            str(model_path),
-            "--threads",
-            str(command["threads"]),
-            "--max-context",
-            str(command["max_context"]),
-            "--translate",
-            str(command["translate"]),
-            "--logprob-thold",
-            str(command["logprob_thold"]),
-            "--no-speech-thold",
-            str(command["no_speech_thold"]),
-            "--word-thold",
-            str(command["word_thold"]), 
-            "--best-of",
-            str(command["best_of"]),
-            "--language",
-            str(command["language"]),
-            "--entropy-thold",
-            str(command["entropy-thold"]),
-            str(command["output_format"]),
-            "--prompt",
-            prompt,
-            "-f",
-            str(audio_file),
-            "-of",
-            str(input_folder / base_name),
-        ]
-
-        print(f"[Whisper] Running command: {' '.join(whisper_cmd)}")
-        # try:
-        #     process = subprocess.run(whisper_cmd, text=True, capture_output=True)
-        #     print(f"[Whisper] Transcription completed for {video_file}.")
-        #     print(process.stdout)
-        # except subprocess.CalledProcessError as e:
-        #     print(f"[Whisper] Error processing {video_file}: {e.stderr}")
-        #     whisper_queue.task_done()
-        #     continue
-
-        # # Remove temporary audio file
-        # try:
-        #     audio_file.unlink()
-        #     print(f"[Whisper] Removed temporary audio file {audio_file}")
-        # except Exception as e:
-        #     print(f"[Whisper] Could not remove audio file {audio_file}: {e}")
-
-        # whisper_queue.task_done()
         process = None  # Initialize process variable for cleanup
+        ffmpeg_process = None  # Only used when audio is piped straight into whisper-cli
         success = False  # Initialize success variable
         try:
+            # Built inside the try so a bad config fails these jobs (and marks them
+            # done) instead of killing the worker and leaving the queue blocked.
+            whisper_cmd = [
+                str(whisper_path),
+                "-m",
+                str(model_path),
+                *_whisper_options(command, threads),
+                "--prompt",
+                prompt,
+            ]
+            # GPU builds offload automatically; only pass the GPU options the binary knows.
+            help_text = _whisper_help(str(whisper_path))
+            if command.get("no_gpu") and "--no-gpu" in help_text:
+                whisper_cmd.append("--no-gpu")
+            elif command.get("device") and "--device" in help_text:
+                whisper_cmd += ["--device", str(command["device"])]
+            if command.get("flash_attn") and "--flash-attn" in help_text:
+                whisper_cmd.append("--flash-attn")
+            for job in jobs:
+                whisper_cmd += [
+                    "-f",
+                    str(job.audio_file) if job.audio_file is not None else "-",
+                    "-of",
+                    str(job.input_folder / job.base_name),
+                ]
+
+            print(f"[Whisper] Running command: {' '.join(whisper_cmd)}")
+            if audio_file is None:
+                # Stream FFmpeg's WAV output into whisper-cli's stdin instead of
+                # writing an intermediate file to disk.
+                ffmpeg_cmd = _ffmpeg_command(jobs[0].video_file, "pipe:1", jobs[0].audio_filter)
+                print(f"[FFmpeg] Running command: {' '.join(ffmpeg_cmd)}")
+                try:
+                    ffmpeg_process = subprocess.Popen(
+                        ffmpeg_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE
+                    )
+                except FileNotFoundError:
+                    print(f"[FFmpeg] Error: FFmpeg executable '{ffmpeg_cmd[0]}' not found. Cannot process {video_file}.", file=sys.stderr)
+                    continue  # The finally block below still marks the job done
+                _widen_pipe(ffmpeg_process.stdout)
             # --- Start Subprocess with Popen ---
             process = subprocess.Popen(
                 whisper_cmd,
+                stdin=ffmpeg_process.stdout if ffmpeg_process else None,
                 stdout=subprocess.PIPE,    # Capture stdout
                 stderr=subprocess.STDOUT,  # Redirect stderr TO stdout stream
-                text=True,                 # Decode output as text
-                encoding=cli_encoding,     # Specify expected encoding
-                errors='replace',          # How to handle decoding errors
-                bufsize=1,                 # Use line buffering
                 shell=False                # Do NOT use shell=True unless essential
                                            # (security risk, quoting issues)
             )
+            _widen_pipe(process.stdout)
+            if ffmpeg_process:
+                # Drop our copy so FFmpeg gets SIGPIPE if whisper-cli exits early.
+                ffmpeg_process.stdout.close()
 
             # --- Read and Display Output in Real-Time ---
             print(f"--- [Whisper Output Start: {base_name}] ---")
-            # Read line by line until the process's stdout stream is closed
+            # Pass output through in whatever chunks are available (one read each)
+            # until the process's stdout stream is closed.
             if process.stdout:
-                for line in iter(process.stdout.readline, ''):
-                    sys.stdout.write(line)  # Write the line directly
-                    sys.stdout.flush()      # Ensure it appears immediately
+                out = getattr(sys.stdout, "buffer", None)
+                decoder = codecs.getincrementaldecoder(cli_encoding)(errors="replace")
+                sys.stdout.flush()  # Keep ordering with the text written above
+                while chunk := process.stdout.read1(1 << 16):
+                    if out is not None:
+                        out.write(chunk)
+                        out.flush()  # Ensure it appears immediately
+                    else:  # stdout replaced by a text-only stream
+                        sys.stdout.write(decoder.decode(chunk))
+                        sys.stdout.flush()
             print(f"\n--- [Whisper Output End: {base_name}] ---") # Add newline for clarity
 
             # --- Wait for Process Completion and Check Result ---
-            process.wait() # Wait for the process to fully terminate
+            _wait_event_driven(process) # Wait for the process to fully terminate
             return_code = process.returncode
+            if ffmpeg_process and _wait_event_driven(ffmpeg_process) != 0 and return_code == 0:
+                print(f"[FFmpeg] Error: FFmpeg exited with code {ffmpeg_process.returncode} for {video_file}", file=sys.stderr)
+                return_code = ffmpeg_process.returncode
 
             if return_code == 0:
                 print(f"[Whisper] Transcription completed successfully for {video_file} (Exit Code: {return_code}).")
@@ -202,6 +539,9 @@ def whisper_worker() -> None:
                 print(f"[Whisper] Error: Whisper process for {video_file} failed with Exit Code: {return_code}", file=sys.stderr)
                 success = False
 
+        except KeyError as e:
+            print(f"[Whisper] Error: Whisper.cpp command config is missing option {e}. Cannot process {video_file}.", file=sys.stderr)
+            success = False
         except FileNotFoundError:
             print(f"[Whisper] Error: Whisper executable not found at '{whisper_path}'. Cannot process {video_file}.", file=sys.stderr)
             # No process started, job failed. Ensure success remains False.
@@ -223,27 +563,34 @@ def whisper_worker() -> None:
                  except Exception as term_e:
                      print(f"[Whisper] Error during process termination: {term_e}", file=sys.stderr)
         finally:
+            if ffmpeg_process and ffmpeg_process.poll() is None:
+                ffmpeg_process.kill()
+                ffmpeg_process.wait()
             # --- Cleanup ---
-            if success:
-                # Remove temporary audio file only on success
-                try:
-                    if audio_file.exists(): # Check if it still exists
-                        audio_file.unlink()
-                        print(f"[Whisper] Removed temporary audio file: {audio_file}")
-                    else:
-                        print(f"[Whisper] Temporary audio file already removed or not found: {audio_file}")
-                except Exception as e:
-                    # Log failure to remove, but don't let it stop the worker
-                    print(f"[Whisper] Warning: Could not remove temporary audio file {audio_file}: {e}", file=sys.stderr)
-            else:
-                # Optionally keep the audio file for debugging on error
-                if audio_file.exists():
-                    print(f"[Whisper] Keeping temporary audio file due to failure: {audio_file}", file=sys.stderr)
-
-            # --- Mark Job Done ---
-            # Crucial: Mark the job as done in the queue regardless of outcome.
-            # This allows queue.join() to eventually unblock if used elsewhere.
-            whisper_queue.task_done()
+            for job in jobs:
+                audio_file = job.audio_file
+                if audio_file is None:
+                    pass  # Nothing was written to disk
+                elif success:
+                    # Remove temporary audio file only on success
+                    try:
+                        if audio_file.exists(): # Check if it still exists
+                            audio_file.unlink()
+                            print(f"[Whisper] Removed temporary audio file: {audio_file}")
+                        else:
+                            print(f"[Whisper] Temporary audio file already removed or not found: {audio_file}")
+                    except Exception as e:
+                        # Log failure to remove, but don't let it stop the worker
+                        print(f"[Whisper] Warning: Could not remove temporary audio file {audio_file}: {e}", file=sys.stderr)
+                else:
+                    # Optionally keep the audio file for debugging on error
+                    if audio_file.exists():
+                        print(f"[Whisper] Keeping temporary audio file due to failure: {audio_file}", file=sys.stderr)
+
+                # --- Mark Job Done ---
+                # Crucial: Mark the job as done in the queue regardless of outcome.
+                # This allows queue.join() to eventually unblock if used elsewhere.
+                job_queue.task_done()
             print(f"--- [Whisper] Finished processing job for: {video_file} ---")
             
 
@@ -252,16 +599,46 @@ def transcribe_videos(
     input_folder: str | Path,
     whisper_root: str | Path,
     prompt: str = "",
-    suffix: tuple[str, ...] = (".m4v", ".mp4", ".mkv"),
+    suffix: tuple[str, ...] | str = (".m4v", ".mp4", ".mkv"),
+    pipe_audio: bool = False,
+    audio_filter: str = "highpass=200,lowpass=3000",
+    batch_size: int = 8,
+    ffmpeg_batch_size: int = 1,
+    overwrite: bool = False,
+    whisper_workers: int = 1,
+    ffmpeg_workers: int = 2,
 ) -> None:
     """Process all video files in the input folder.
     Args:
         input_folder (Path or str): Folder containing video files.
         whisper_root (Path or str): Path to the whisper.cpp root directory.
         prompt (str): Prompt for Whisper transcription.
-        suffix (tuple[str]): Extensions to process.
+        suffix (tuple[str] or str): Extensions to process, case-insensitive. A
+            comma-separated string is also accepted.
+        pipe_audio (bool): Pipe FFmpeg's output straight into whisper-cli instead of
+            writing a temporary WAV file next to each video.
+        audio_filter (str): FFmpeg audio filter graph applied before transcription.
+            The default band-pass is cheap; appending ",afftdn,dialoguenhance"
+            cleans up noisy sources but makes extraction several times slower.
+        batch_size (int): Maximum number of extracted files transcribed by one
+            whisper-cli call. Ignored when pipe_audio is set.
+        ffmpeg_batch_size (int): Number of videos decoded by one FFmpeg process.
+            Values above 1 save process startup on libraries of short clips.
+            Ignored when pipe_audio is set.
+        overwrite (bool): Transcribe videos even if an .srt newer than the video
+            already exists next to it.
+        whisper_workers (int): Number of whisper-cli processes running at once.
+            With automatic threads, each gets an equal share of the physical cores.
+        ffmpeg_workers (int): Number of FFmpeg processes running at once. FFmpeg is
+            multi-threaded itself, so a couple is enough to keep whisper-cli fed
+            without the extractions competing for the disk. Ignored when pipe_audio is set.
     """
-    whisper_queue = queue.Queue()
+    # FFmpeg extraction (producer) overlaps with Whisper transcription (consumer).
+    # The queue is bounded so extraction only runs about one batch (or two jobs
+    # per worker) ahead and producers block instead of piling WAV files up on disk.
+    batch_size = max(1, int(batch_size))
+    whisper_workers = max(1, int(whisper_workers))
+    job_queue = queue.Queue(maxsize=max(2 * whisper_workers, batch_size))
     input_folder = Path(input_folder)
     whisper_root = Path(whisper_root)
     if not input_folder.exists():
@@ -270,46 +647,82 @@ def transcribe_videos(
     if not whisper_root.exists():
         print(f"Error: Directory '{whisper_root}' not found.")
         return
+    if isinstance(suffix, str):
+        suffix = suffix.split(",")
+    exts = tuple(ext.strip().lower() for ext in suffix)
+    command = _load_whisper_command()
+    try:
+        _whisper_options(command, 0)
+    except KeyError as e:
+        print(f"Error: Whisper.cpp command config is missing option {e}.")
+        return
+    # Shared by every job, so they are resolved once rather than per video.
+    whisper_path = whisper_root / "build/bin/Release/whisper-cli.exe"
+    model_path = whisper_root / "models" / command.get("model", "ggml-large-v3.bin")
+    if not model_path.exists():
+        print(f"Error: Model '{model_path}' not found.")
+        return
+    video_files = _iter_video_files(str(input_folder), exts)
+    if not overwrite:
+        video_files = (v for v in video_files if not _is_transcribed(v))
 
-    # Start whisper worker thread
-    worker_thread = threading.Thread(target=whisper_worker, daemon=True)
-    worker_thread.start()
+    # Start whisper worker threads
+    worker_threads = [
+        threading.Thread(
+            target=functools.partial(
+                whisper_worker, job_queue, batch_size, whisper_workers, command
+            ),
+            daemon=True,
+        )
+        for _ in range(whisper_workers)
+    ]
+    for worker_thread in worker_threads:
+        worker_thread.start()
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = []
-        for video_file in input_folder.rglob("*"):
-            if video_file.suffix.lower() in suffix:
-                futures.append(
-                    executor.submit(extract_audio, video_file, whisper_root, prompt)
-                )
-        # Wait for all ffmpeg extraction jobs to complete
-        concurrent.futures.wait(futures)
+    if pipe_audio:
+        # FFmpeg is started by the whisper worker itself, so there is no
+        # extraction stage; just hand the videos over.
+        for video_file in video_files:
+            job_queue.put(
+                _make_job(video_file, whisper_path, model_path, prompt, None, audio_filter)
+            )
+    else:
+        ffmpeg_batch_size = max(1, int(ffmpeg_batch_size))
+        ffmpeg_workers = max(1, int(ffmpeg_workers))
+        extract = functools.partial(
+            extract_audio_batch,
+            job_queue,
+            whisper_path=whisper_path,
+            model_path=model_path,
+            prompt=prompt,
+            audio_filter=audio_filter,
+        )
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ffmpeg_workers) as executor:
+            futures = []
+            pending = []
+            for video_file in video_files:
+                pending.append(video_file)
+                if len(pending) == ffmpeg_batch_size:
+                    futures.append(executor.submit(extract, pending))
+                    pending = []
+            if pending:
+                futures.append(executor.submit(extract, pending))
+            # Wait for all ffmpeg extraction jobs to complete
+            concurrent.futures.wait(futures)
 
     # Wait until all whisper jobs are done
-    whisper_queue.join()
+    job_queue.join()
 
-    # Stop the whisper worker
-    whisper_queue.put(None)
-    worker_thread.join()
+    # Stop the whisper workers, one sentinel each
+    for _ in worker_threads:
+        job_queue.put(None)
+    for worker_thread in worker_threads:
+        worker_thread.join()
 
     print(f"Transcription completed for all videos in '{input_folder}'.")
     return
 
 
-# def run_batch_transcribe(
-#     input_folder: str | Path,
-#     whisper_root: str | Path,
-#     prompt: str = "",
-#     suffix: tuple[str, ...] = (".m4v", ".mp4", ".mkv"),
-#     language: str = "auto"
-# ) -> None:
-#     """Main loop prompting for input folders and processing videos."""
-#     global whisper_queue
-#     whisper_queue = queue.Queue()
-#     while True:
-#         transcribe_videos(input_folder, whisper_root, prompt, suffix,language=language)
-
-
 if __name__ == "__main__":
     while True:
         input_folder, whisper_root = get_input_folder()
@@ -322,4 +735,4 @@ if __name__ == "__main__":
         )
         if not prompt:
             prompt = ""
-        transcribe_videos(input_folder, whisper_root, prompt="", suffix=(".m4v",))
+        transcribe_videos(input_folder, whisper_root, prompt=prompt, suffix=suffix)
@@ -1,10 +1,50 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
 import shutil
+import stat
 import zipfile
 import hashlib
 import asyncio
+import contextlib
+import functools
+import io
+import mmap
+import os
+import tarfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+try:
+    from fastcrc import crc32 as fastcrc32
+except ImportError:
+    fastcrc32 = None
 __docformat__ = "google"
+# Archive extension for each codec accepted by zip_directory.
+ARCHIVE_SUFFIXES = {"zip": ".zip", "isal": ".zip", "zstd": ".tar.zst"}
+# Files up to this size are compressed in memory on worker threads; larger ones are streamed.
+_PARALLEL_MAX_SIZE = 64 << 20
+# Files under this size are grouped, up to _BATCH_SIZE bytes per worker task.
+_SMALL_FILE_SIZE = 64 << 10
+_BATCH_SIZE = 1 << 20
+# Bytes of file data being compressed in memory at once, across all workers.
+_MAX_IN_FLIGHT = 256 << 20
+# Linux only; elsewhere stored members are copied through user space
+_HAS_COPY_RANGE = hasattr(os, "copy_file_range")
+# Already compressed formats; deflating them again costs CPU and saves nothing.
+_STORED_EXTS = frozenset({
+    ".mp4", ".mkv", ".m4v", ".mov", ".webm", ".avi", ".wmv",
+    ".mp3", ".m4a", ".aac", ".opus", ".ogg", ".flac",
+    ".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif", ".heic",
+    ".zip", ".7z", ".rar", ".zst", ".gz", ".xz", ".bz2",
+})
 def is_leaf_directory(folder: Path) -> bool:
     """Check if a directory is a leaf directory (has no subdirectories) and is non-empty.
     Args:
@@ -20,16 +60,325 @@ def is_leaf_directory(folder: Path) -> bool:
     )
 
 
-def zip_directory(folder: Path, zip_path: Path) -> None:
+class HashingWriter(io.RawIOBase):
+    """Write-only stream that computes the SHA-256 of everything written through it.
+    It is not seekable, so zipfile writes data descriptors instead of seeking back
+    to patch headers, and the digest always matches the bytes on disk.
+    Args:
+        f (BinaryIO): Underlying binary file; it is not closed by the writer.
+    """
+
+    def __init__(self, f) -> None:
+        super().__init__()
+        self.f = f
+        self.h = hashlib.sha256()
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.h.update(b)
+        n = self.f.write(b)
+        self._pos += n
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        if not self.f.closed:  # close() flushes, possibly after the file underneath was closed
+            self.f.flush()
+
+    def copy_range(self, src_fd: int, data) -> None:
+        """Append a whole source file, copying it inside the kernel where possible.
+        Only the hash reads the data in user space, from a mapping of the source.
+        Args:
+            src_fd (int): Descriptor of the source file.
+            data (mmap): Read-only mapping of the same file.
+        """
+        # Buffered bytes must land before the copied ones. The kernel copy then writes at,
+        # and advances, the descriptor's offset, where later buffered writes continue.
+        self.f.flush()
+        size = len(data)
+        copied = 0
+        if _HAS_COPY_RANGE:
+            dst_fd = self.f.fileno()
+            try:
+                while copied < size:
+                    n = os.copy_file_range(src_fd, dst_fd, size - copied, copied)
+                    if n == 0:
+                        raise OSError(f"Source file shrank while copying ({copied} of {size} bytes)")
+                    copied += n
+            except OSError:
+                if copied:
+                    raise
+        if not copied:  # Unsupported here; copy through user space instead
+            self.f.write(data)
+        self.h.update(data)
+        self._pos += size
+
+    def hexdigest(self) -> str:
+        """Return the SHA-256 checksum of the bytes written so far."""
+        return self.h.hexdigest()
+
+
+def _iter_leaf_directories(source_folder: Path):
+    """Yield every non-empty directory below source_folder that has no subdirectories.
+    A single os.walk pass classifies each directory from its listing, instead of
+    listing and stat-ing every candidate again as is_leaf_directory does.
+    Args:
+        source_folder (Path): The directory to search; it is never yielded itself.
+    """
+    root = os.fspath(source_folder)
+    for dirpath, dirnames, filenames in os.walk(root):
+        if not dirnames and filenames and dirpath != root:
+            yield Path(dirpath)
+
+
+def _iter_archive_files(folder: Path):
+    """Yield (path, arcname) for everything below folder, in the order rglob would.
+    Args:
+        folder (Path): The directory being archived.
+    """
+    parent = os.path.dirname(os.path.abspath(folder))
+    for dirpath, _, filenames in os.walk(folder):
+        prefix = os.path.relpath(dirpath, parent)
+        for name in filenames:
+            yield os.path.join(dirpath, name), os.path.join(prefix, name)
+
+
+def codec_available(codec: str) -> bool:
+    """Check whether the library needed by an archive codec is installed.
+    Args:
+        codec (str): One of ARCHIVE_SUFFIXES.
+    Returns:
+        bool: True if zip_directory can use the codec.
+    """
+    if codec == "zstd":
+        return zstandard is not None
+    if codec == "isal":
+        return isal_zlib is not None
+    return codec in ARCHIVE_SUFFIXES
+
+
+def _crc32(data, deflate=zlib) -> int:
+    """CRC-32 of a member as stored in the zip.
+    Uses fastcrc's carry-less multiply implementation when it is installed, otherwise
+    the crc32 of the deflate module in use.
+    Args:
+        data (bytes | mmap): The member's uncompressed bytes.
+        deflate (module): zlib or isal_zlib.
+    """
+    if fastcrc32 is not None:
+        return fastcrc32.iso_hdlc(data)
+    return deflate.crc32(data)
+
+
+def _compress_member(
+    file: str, arcname: str, deflate=zlib, store: bool = False
+) -> tuple[zipfile.ZipInfo, bytes]:
+    """Deflate a file in memory, as zipfile would, for writing with _write_member.
+    Args:
+        file (str): The file to compress.
+        arcname (str): Its name inside the archive.
+        deflate (module): zlib, or the zlib-compatible isal_zlib.
+        store (bool): Store the data uncompressed instead.
+    Returns:
+        tuple[ZipInfo, bytes]: The member's header information and raw DEFLATE (or stored) data.
+    """
+    info = zipfile.ZipInfo.from_file(file, arcname)
+    with open(file, "rb") as f:
+        data = f.read()
+    if store:
+        packed = data
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        # zlib releases the GIL while compressing, so members deflate in parallel on threads.
+        compressor = deflate.compressobj(deflate.Z_DEFAULT_COMPRESSION, deflate.DEFLATED, -15)
+        packed = compressor.compress(data) + compressor.flush()
+        info.compress_type = zipfile.ZIP_DEFLATED
+    info.file_size = len(data)
+    info.compress_size = len(packed)
+    info.CRC = _crc32(data, deflate)
+    return info, packed
+
+
+def _compress_batch(
+    members: list[tuple[str, str, bool]], deflate=zlib
+) -> list[tuple[zipfile.ZipInfo, bytes]]:
+    """Compress several files in one worker task, so tiny files do not each pay for a future.
+    Args:
+        members (list[tuple[str, str, bool]]): (file, arcname, store) for each file, in archive order.
+        deflate (module): zlib, or the zlib-compatible isal_zlib.
+    Returns:
+        list[tuple[ZipInfo, bytes]]: The results of _compress_member, in the same order.
+    """
+    return [_compress_member(file, arcname, deflate, store) for file, arcname, store in members]
+
+
+def _submit_batch(
+    executor: ThreadPoolExecutor,
+    zipf: zipfile.ZipFile,
+    pending: deque,
+    batch: list[tuple[str, str, bool]],
+    batch_bytes: int,
+    deflate=zlib,
+    max_pending: int = 1,
+) -> None:
+    """Queue a batch for compression, first writing out the oldest batches until it fits in the window.
+    The window holds at most max_pending batches and _MAX_IN_FLIGHT bytes of file data,
+    except that a single batch is always accepted.
+    Args:
+        executor (ThreadPoolExecutor): Pool compressing the batches.
+        zipf (ZipFile): The archive being written.
+        pending (deque): In-order window of (future, batch_bytes) pairs.
+        batch (list[tuple[str, str, bool]]): (file, arcname, store) for each file.
+        batch_bytes (int): Total size of the batch's files.
+        deflate (module): zlib, or the zlib-compatible isal_zlib.
+        max_pending (int): Most batches compressing at once.
+    """
+    while pending and (
+        len(pending) >= max_pending
+        or sum(size for _, size in pending) + batch_bytes > _MAX_IN_FLIGHT
+    ):
+        _write_batch(zipf, pending.popleft()[0].result())
+    pending.append((executor.submit(_compress_batch, batch, deflate), batch_bytes))
+
+
+def _write_batch(zipf: zipfile.ZipFile, members: list[tuple[zipfile.ZipInfo, bytes]]) -> None:
+    """Append the members compressed by _compress_batch, in order."""
+    for info, packed in members:
+        _write_member(zipf, info, packed)
+
+
+def _append_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, write_data) -> None:
+    """Append a member whose data is already in its final stored or raw DEFLATE form.
+    zipfile has no public API for this, so, as ZipFile.write does internally, the local
+    header and data are written at the end of zipf.fp and the entry is registered in
+    filelist and NameToInfo for ZipFile.close() to list in the central directory.
+    All use of those zipfile internals is kept here.
+    Args:
+        zipf (ZipFile): The archive being written, with no member open for writing.
+        info (ZipInfo): Header information with the CRC and sizes already set.
+        write_data (Callable[[BinaryIO], None]): Writes the member's data to zipf.fp.
+    """
+    info.header_offset = zipf.fp.tell()
+    zipf.fp.write(info.FileHeader())
+    write_data(zipf.fp)
+    zipf.filelist.append(info)
+    zipf.NameToInfo[info.filename] = info
+    zipf.start_dir = zipf.fp.tell()
+
+
+def _write_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, packed: bytes) -> None:
+    """Append an already compressed member to a zip archive opened for writing.
+    Args:
+        zipf (ZipFile): The archive being written.
+        info (ZipInfo): Header information from _compress_member.
+        packed (bytes): The compressed data.
+    """
+    _append_member(zipf, info, lambda fp: fp.write(packed))
+
+
+def _tar_zstd_directory(folder: Path, out) -> None:
+    """Create a zstd-compressed tar archive of the given folder.
+    Args:
+        folder (Path): The directory to archive.
+        out (BinaryIO): Binary file the .tar.zst data is written to; left open.
+    """
+    compressor = zstandard.ZstdCompressor(level=3, threads=-1)  # Multi-threaded compression
+    with compressor.stream_writer(out, closefd=False) as writer, \
+            tarfile.open(fileobj=writer, mode="w|") as tar:
+        for file, arcname in _iter_archive_files(folder):
+            if os.path.isfile(file):
+                tar.add(file, arcname=arcname.replace(os.sep, "/"))
+
+
+def _write_stored_member(zipf: zipfile.ZipFile, file: str, arcname: str, deflate=zlib) -> None:
+    """Append a large file uncompressed to a zip written through a HashingWriter.
+    The CRC is computed from a memory mapping and the data copied with
+    HashingWriter.copy_range, so the file is never read into Python buffers.
+    Args:
+        zipf (ZipFile): The archive being written.
+        file (str): The file to store.
+        arcname (str): Its name inside the archive.
+        deflate (module): zlib or isal_zlib, used for the CRC.
+    """
+    info = zipfile.ZipInfo.from_file(file, arcname)
+    info.compress_type = zipfile.ZIP_STORED
+    with open(file, "rb") as src, \
+            mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        info.file_size = info.compress_size = len(data)
+        info.CRC = _crc32(data, deflate)
+        # copy_range flushes the buffered header before the kernel copies after it.
+        _append_member(zipf, info, lambda fp: fp.copy_range(src.fileno(), data))
+
+
+def zip_directory(
+    folder: Path, zip_path, max_workers: int | None = None, codec: str = "zip"
+) -> None:
     """Create a zip archive of the given folder.
+    Files are compressed concurrently and written in directory order, so the
+    archive is the same as a serial run would produce. Small files are handed to
+    the workers in batches, with at most 256 MiB of file data in memory at once.
+    Media and other already compressed files are stored as they are.
     Args:
         folder (Path): The directory to zip.
-        zip_path (Path): The path where the zip file will be saved.
+        zip_path (Path or BinaryIO): The path where the zip file will be saved, or
+            a binary file to write it to (e.g. a HashingWriter).
+        max_workers (int): Number of compression threads. Defaults to the CPU count.
+        codec (str): "zip" for a standard zip, "isal" for a zip deflated with ISA-L
+            (needs the isal package; files over 64 MiB still use zlib), or "zstd"
+            for a multi-threaded .tar.zst archive (needs the zstandard package).
     """
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file in folder.rglob("*"):  # Recursively get all files
-            if file.is_file():  # Only include files, not directories
-                zipf.write(file, file.relative_to(folder.parent))
+    if not codec_available(codec):
+        raise ValueError(f"Archive codec '{codec}' is unknown or its library is not installed.")
+    if codec == "zstd":
+        if isinstance(zip_path, (str, os.PathLike)):
+            with open(zip_path, "wb") as f:
+                _tar_zstd_directory(folder, f)
+        else:
+            _tar_zstd_directory(folder, zip_path)
+        return
+    deflate = isal_zlib if codec == "isal" else zlib
+    max_workers = max_workers or os.cpu_count() or 1
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()  # In-order window of (future, batch_bytes) being compressed
+        max_pending = 2 * max_workers
+        batch, batch_bytes = [], 0
+        for file, arcname in _iter_archive_files(folder):  # Recursively get all files
+            try:
+                st = os.stat(file)
+            except OSError:  # Broken symlink
+                continue
+            if not stat.S_ISREG(st.st_mode):  # Only include regular files
+                continue
+            dot = file.rfind(".")
+            store = dot > file.rfind(os.sep) and file[dot:].lower() in _STORED_EXTS
+            if st.st_size > _PARALLEL_MAX_SIZE:
+                # Too big to hold in memory; stream it once everything before it is written.
+                if batch:
+                    _submit_batch(executor, zipf, pending, batch, batch_bytes, deflate, max_pending)
+                    batch, batch_bytes = [], 0
+                while pending:
+                    _write_batch(zipf, pending.popleft()[0].result())
+                if store and isinstance(zipf.fp, HashingWriter):
+                    _write_stored_member(zipf, file, arcname, deflate)
+                else:
+                    zipf.write(file, arcname, zipfile.ZIP_STORED if store else None)
+                continue
+            batch.append((file, arcname, store))
+            batch_bytes += st.st_size
+            if st.st_size < _SMALL_FILE_SIZE and batch_bytes < _BATCH_SIZE:
+                continue  # Keep gathering small files into one task
+            _submit_batch(executor, zipf, pending, batch, batch_bytes, deflate, max_pending)
+            batch, batch_bytes = [], 0
+        if batch:
+            _submit_batch(executor, zipf, pending, batch, batch_bytes, deflate, max_pending)
+        while pending:
+            _write_batch(zipf, pending.popleft()[0].result())
 
 
 def compute_checksum(file_path: Path) -> str:
@@ -39,19 +388,172 @@ def compute_checksum(file_path: Path) -> str:
     Returns:
         str: The SHA-256 checksum of the file.
     """
-    sha256 = hashlib.sha256()
-    with file_path.open("rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256.update(chunk)
+    with file_path.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: read and hash loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        sha256 = hashlib.sha256()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while size := f.readinto(buf):
+            sha256.update(view[:size])
     return sha256.hexdigest()
 
 
-def zip_and_move(source_folder: str | Path, destination_folder: str | Path) -> None:
+def dir_fingerprint(folder: Path) -> str:
+    """Fingerprint the files in a directory by name, size and modification time.
+    Args:
+        folder (Path): The directory to fingerprint.
+    Returns:
+        str: A BLAKE2b digest that changes whenever a file is added, removed or modified.
+    """
+    entries = []
+    for file, _ in _iter_archive_files(folder):  # The same files zip_directory sees
+        try:
+            st = os.stat(file)
+        except OSError:  # Broken symlink, or removed while walking
+            continue
+        if not stat.S_ISREG(st.st_mode):  # Only files end up in the zip
+            continue
+        entries.append((os.path.relpath(file, folder).split(os.sep), st))
+    h = hashlib.blake2b(digest_size=16)
+    for parts, st in sorted(entries, key=lambda entry: entry[0]):  # Path order, as rglob was sorted
+        h.update(f"{'/'.join(parts)}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _fingerprint_sidecar(zip_path: Path) -> Path:
+    """Return the path of the .fp file recording which folder contents zip_path was built from."""
+    return zip_path.with_name(f"{zip_path.name}.fp")
+
+
+def _checksum_sidecar(zip_path: Path) -> Path:
+    """Return the path of the .sha256 file caching the checksum of zip_path."""
+    return zip_path.with_name(f"{zip_path.name}.sha256")
+
+
+def _write_checksum(zip_path: Path, checksum: str) -> None:
+    """Store the checksum of zip_path next to it, in sha256sum format."""
+    try:
+        _checksum_sidecar(zip_path).write_text(f"{checksum}  {zip_path.name}\n", encoding="utf-8")
+    except OSError as e:
+        print(f"Could not write checksum for {zip_path}: {e}")
+
+
+def _cached_checksum(zip_path: Path) -> str:
+    """Return the checksum of an existing zip, reading its .sha256 sidecar if it is current.
+    The sidecar is trusted only if it is not older than the zip. Otherwise the
+    zip is hashed and the sidecar rewritten.
+    Args:
+        zip_path (Path): The existing zip file.
+    Returns:
+        str: The SHA-256 checksum of the file.
+    """
+    sidecar = _checksum_sidecar(zip_path)
+    try:
+        if sidecar.stat().st_mtime_ns >= zip_path.stat().st_mtime_ns:
+            return sidecar.read_text(encoding="utf-8").split()[0]
+    except (OSError, IndexError):
+        pass
+    checksum = compute_checksum(zip_path)
+    _write_checksum(zip_path, checksum)
+    return checksum
+
+
+def _store_zip(
+    folder: Path, temp_zip_path: Path, zip_path: Path, new_checksum: str | None = None
+) -> bool:
+    """Move a freshly built zip into place unless an identical one is already there.
+    Checksums are only compared when the sizes match; a different size already
+    proves the archive changed.
+    Args:
+        folder (Path): The leaf directory that was zipped.
+        temp_zip_path (Path): The freshly built zip file.
+        zip_path (Path): Where the zip file belongs.
+        new_checksum (str): Checksum of temp_zip_path if already known.
+    Returns:
+        bool: True if zip_path now holds the new archive (moved or already identical).
+    """
+    if zip_path.exists() and zip_path.stat().st_size == temp_zip_path.stat().st_size:
+        if new_checksum is None:
+            new_checksum = compute_checksum(temp_zip_path)
+        if _cached_checksum(zip_path) == new_checksum:
+            print(
+                f"Skipping {zip_path} as it already exists and matches the checksum."
+            )
+            temp_zip_path.unlink()  # Remove temporary zip file
+            return True
+
+    print(f"Moving {folder} to {zip_path.parent}")
+    try:
+        try:
+            os.replace(temp_zip_path, zip_path)  # Atomic rename on the same filesystem
+        except OSError:
+            shutil.move(temp_zip_path, zip_path)
+    except Exception as e:
+        print(f"Error moving {temp_zip_path} to {zip_path}: {e}")
+        temp_zip_path.unlink(missing_ok=True)
+        return False
+    if new_checksum is not None:
+        _write_checksum(zip_path, new_checksum)
+    else:
+        _checksum_sidecar(zip_path).unlink(missing_ok=True)  # Stale; rebuilt on demand
+    return True
+
+
+def _zip_if_changed(
+    folder: Path,
+    temp_zip_path: Path,
+    zip_path: Path,
+    codec: str = "zip",
+    max_workers: int | None = None,
+) -> None:
+    """Zip a leaf directory into zip_path, skipping it if unchanged since the last run.
+    The folder's fingerprint is stored next to the zip after every successful run,
+    so an unchanged folder is neither compressed nor hashed again.
+    Args:
+        folder (Path): The leaf directory to zip.
+        temp_zip_path (Path): Where the zip is built before being moved.
+        zip_path (Path): Where the zip file belongs.
+        codec (str): Archive codec passed to zip_directory.
+        max_workers (int): Compression threads passed to zip_directory.
+    """
+    # The codec is part of the fingerprint so switching codecs rebuilds the archives.
+    fingerprint = f"{codec} {dir_fingerprint(folder)}"
+    fp_path = _fingerprint_sidecar(zip_path)
+    try:
+        unchanged = zip_path.exists() and fp_path.read_text(encoding="utf-8").strip() == fingerprint
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"Skipping {zip_path} as {folder} is unchanged.")
+        return
+    # Hash the archive while it is written instead of reading it back afterwards.
+    try:
+        # The writer is closed before the file under it, so its final flush has somewhere to go.
+        with open(temp_zip_path, "wb") as f, HashingWriter(f) as writer:
+            zip_directory(folder, writer, max_workers, codec)
+    except BaseException:
+        temp_zip_path.unlink(missing_ok=True)  # Don't leave a partial archive in the destination
+        raise
+    if _store_zip(folder, temp_zip_path, zip_path, writer.hexdigest()):
+        try:
+            fp_path.write_text(fingerprint, encoding="utf-8")
+        except OSError as e:
+            print(f"Could not write fingerprint for {zip_path}: {e}")
+
+
+def zip_and_move(
+    source_folder: str | Path, destination_folder: str | Path, codec: str = "zip"
+) -> None:
     """Zip leaf directories and move them to the destination folder.
     Args:
         source_folder (Path or str): The source directory containing folders to zip.
         destination_folder (Path or str): The destination directory where zipped folders will be moved.
+        codec (str): Archive codec, see zip_directory.
     """
+    if not codec_available(codec):
+        print(f"Archive codec '{codec}' is unknown or its library is not installed.")
+        return
     source_folder = Path(source_folder)
     destination_folder = Path(destination_folder)
     if not source_folder.is_dir() or not destination_folder.is_dir():
@@ -59,78 +561,81 @@ def zip_and_move(source_folder: str | Path, destination_folder: str | Path) -> N
             f"Either '{source_folder}' or '{destination_folder}' is not a valid directory."
         )
         return
-    for folder in source_folder.rglob("*"):
-        if is_leaf_directory(folder):
-            # Create relative path for preserving structure
-            relative_path = folder.relative_to(source_folder)
-            zip_name = f"{folder.name}.zip"
-
-            # Create destination path maintaining original structure
-            dest_path = destination_folder / relative_path.parent
-            dest_path.mkdir(parents=True, exist_ok=True)
-
-            # Zip and move
-            zip_path = dest_path / zip_name
-            temp_zip_path = folder.parents[0] / f"{folder.name}_temp.zip"
-            zip_directory(folder, temp_zip_path)
-
-            if zip_path.exists():
-                existing_checksum = compute_checksum(zip_path)
-                new_checksum = compute_checksum(temp_zip_path)
-                if existing_checksum == new_checksum:
-                    print(
-                        f"Skipping {zip_path} as it already exists and matches the checksum."
-                    )
-                    temp_zip_path.unlink()  # Remove temporary zip file
-            else:
-                print(f"Moving {folder} to {dest_path}")
-                try:
-                    shutil.move(temp_zip_path, zip_path)
-                except Exception as e:
-                    print(f"Error moving {temp_zip_path} to {zip_path}: {e}")
-                    temp_zip_path.unlink(missing_ok=True)
-
-async def process_leaf_folder(folder: Path, source_folder: Path, destination_folder: Path) -> None:
+    for folder in _iter_leaf_directories(source_folder):
+        # Create relative path for preserving structure
+        relative_path = folder.relative_to(source_folder)
+        suffix = ARCHIVE_SUFFIXES[codec]
+        zip_name = f"{folder.name}{suffix}"
+
+        # Create destination path maintaining original structure
+        dest_path = destination_folder / relative_path.parent
+        dest_path.mkdir(parents=True, exist_ok=True)
+
+        # Zip and move
+        zip_path = dest_path / zip_name
+        # Built next to its destination so moving it into place is a rename.
+        temp_zip_path = dest_path / f".{folder.name}{suffix}.tmp"
+        _zip_if_changed(folder, temp_zip_path, zip_path, codec)
+
+async def process_leaf_folder(
+    folder: Path,
+    source_folder: Path,
+    destination_folder: Path,
+    codec: str = "zip",
+    executor: ThreadPoolExecutor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    compress_workers: int | None = None,
+) -> None:
     """Process a leaf directory: zip it and move to the destination folder.
     Args:
         folder (Path): The leaf directory to process.
         source_folder (Path): The source directory containing folders to zip.
         destination_folder (Path): The destination directory where zipped folders will be moved.
+        codec (str): Archive codec, see zip_directory.
+        executor (ThreadPoolExecutor): Pool running the blocking work. Defaults to the loop's default executor.
+        semaphore (asyncio.Semaphore): Limits how many folders are processed at once.
+        compress_workers (int): Compression threads used for this folder.
     """
-    # Create relative path for preserving structure
-    relative_path = folder.relative_to(source_folder)
-    zip_name = f"{folder.name}.zip"
+    async with semaphore or contextlib.nullcontext():
+        # Create relative path for preserving structure
+        relative_path = folder.relative_to(source_folder)
+        suffix = ARCHIVE_SUFFIXES[codec]
+        zip_name = f"{folder.name}{suffix}"
 
-    # Create destination path maintaining original structure
-    dest_path = destination_folder / relative_path.parent
-    dest_path.mkdir(parents=True, exist_ok=True)
+        # Create destination path maintaining original structure
+        dest_path = destination_folder / relative_path.parent
+        dest_path.mkdir(parents=True, exist_ok=True)
 
-    zip_path = dest_path / zip_name
-    temp_zip_path = folder.parents[0] / f"{folder.name}_temp.zip"
+        zip_path = dest_path / zip_name
+        # Built next to its destination so moving it into place is a rename.
+        temp_zip_path = dest_path / f".{folder.name}{suffix}.tmp"
 
-    # Run zipping in a thread as it's a blocking operation
-    await asyncio.to_thread(zip_directory, folder, temp_zip_path)
-
-    if zip_path.exists():
-        existing_checksum = await asyncio.to_thread(compute_checksum, zip_path)
-        new_checksum = await asyncio.to_thread(compute_checksum, temp_zip_path)
-        if existing_checksum == new_checksum:
-            print(
-                f"Skipping {zip_path} as it already exists and matches the checksum."
-            )
-            temp_zip_path.unlink()  # Remove temporary zip file
-            return
-
-    print(f"Moving {folder} to {dest_path}")
-    await asyncio.to_thread(shutil.move, temp_zip_path, zip_path)
+        # Run zipping in a thread as it's a blocking operation
+        await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                _zip_if_changed, folder, temp_zip_path, zip_path, codec, compress_workers
+            ),
+        )
 
 
-async def async_zip_and_move(source_folder: str | Path, destination_folder: str | Path) -> None:
+async def async_zip_and_move(
+    source_folder: str | Path,
+    destination_folder: str | Path,
+    codec: str = "zip",
+    max_workers: int | None = None,
+) -> None:
     """Zip leaf directories and move them to the destination folder asynchronously.
     Args:
         source_folder (Path or str): The source directory containing folders to zip.
         destination_folder (Path or str): The destination directory where zipped folders will be moved.
+        codec (str): Archive codec, see zip_directory.
+        max_workers (int): Number of folders zipped at once. Defaults to the CPU count;
+            lower it on spinning disks to avoid seeking between archives.
     """
+    if not codec_available(codec):
+        print(f"Archive codec '{codec}' is unknown or its library is not installed.")
+        return
     source_folder = Path(source_folder)
     destination_folder = Path(destination_folder)
     if not source_folder.is_dir():
@@ -141,14 +646,25 @@ async def async_zip_and_move(source_folder: str | Path, destination_folder: str
     if not destination_folder.is_dir():
         print(f"'{destination_folder}' is not a valid directory.")
         destination_folder.mkdir(parents=True, exist_ok=True)
-    tasks = []
-    for folder in source_folder.rglob("*"):
-        if is_leaf_directory(folder):
-            tasks.append(
-                asyncio.create_task(process_leaf_folder(folder, source_folder, destination_folder))
+    folders = list(_iter_leaf_directories(source_folder))
+    if not folders:
+        return
+    cpus = os.cpu_count() or 4
+    max_workers = max_workers or cpus
+    # Folders run in parallel, so each one gets a share of the compression threads.
+    compress_workers = max(1, cpus // min(max_workers, len(folders)))
+    semaphore = asyncio.Semaphore(max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tasks = [
+            asyncio.create_task(
+                process_leaf_folder(
+                    folder, source_folder, destination_folder, codec,
+                    executor, semaphore, compress_workers,
+                )
             )
-    # Wait for all folder processing tasks to finish
-    if tasks:
+            for folder in folders
+        ]
+        # Wait for all folder processing tasks to finish
         await asyncio.gather(*tasks)
 
 
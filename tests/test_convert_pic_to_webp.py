@@ -0,0 +1,80 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ExplicitUtil import convert_pic_to_webp
+
+
+def _webp_bytes(payload: bytes = b"VP8L" + bytes(40)) -> bytes:
+    """A RIFF/WEBP container around payload, as far as _is_valid_webp looks."""
+    return b"RIFF" + (len(payload) + 4).to_bytes(4, "little") + b"WEBP" + payload
+
+
+class IsValidWebpTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.webp = Path(tmp.name) / "out.webp"
+
+    def test_complete_file(self) -> None:
+        self.webp.write_bytes(_webp_bytes())
+        self.assertTrue(convert_pic_to_webp._is_valid_webp(self.webp))
+
+    def test_truncated_file_is_rejected(self) -> None:
+        self.webp.write_bytes(_webp_bytes()[:-10])
+        self.assertFalse(convert_pic_to_webp._is_valid_webp(self.webp))
+        self.webp.write_bytes(_webp_bytes()[:12])
+        self.assertFalse(convert_pic_to_webp._is_valid_webp(self.webp))
+
+    def test_missing_or_foreign_file_is_rejected(self) -> None:
+        self.assertFalse(convert_pic_to_webp._is_valid_webp(self.webp))
+        self.webp.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(40))
+        self.assertFalse(convert_pic_to_webp._is_valid_webp(self.webp))
+        self.webp.write_bytes(b"RIFF")
+        self.assertFalse(convert_pic_to_webp._is_valid_webp(self.webp))
+
+
+class ConvertBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        folder = Path(tmp.name)
+        self.jobs = []
+        for name in ("a", "b"):
+            pic = folder / f"{name}.jpg"
+            pic.write_bytes(b"picture")
+            self.jobs.append((str(pic), str(folder / f"{name}.webp")))
+
+    def test_killed_batch_keeps_sources_and_retries(self) -> None:
+        jobs = self.jobs
+
+        class KilledMagick:
+            """Writes one complete and one cut-off output, then times out."""
+
+            def __init__(self, *args, **kwargs) -> None:
+                self.killed = False
+
+            def communicate(self, *args, timeout=None, **kwargs):
+                if self.killed:
+                    return b"", b""
+                Path(jobs[0][1]).write_bytes(_webp_bytes())
+                Path(jobs[1][1]).write_bytes(_webp_bytes()[:20])
+                raise subprocess.TimeoutExpired("magick", timeout)
+
+            def kill(self) -> None:
+                self.killed = True
+
+        with mock.patch.object(convert_pic_to_webp.subprocess, "Popen", KilledMagick), \
+                mock.patch.object(convert_pic_to_webp, "convert_single_pic", return_value=False) as single:
+            failed = convert_pic_to_webp.convert_batch_via_magick_script(jobs)
+        self.assertEqual(failed, 2)
+        self.assertEqual([call.args[0] for call in single.call_args_list], [pic for pic, _ in jobs])
+        for pic_path, webp_path in jobs:
+            self.assertTrue(Path(pic_path).exists())
+            self.assertFalse(Path(webp_path).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from ExplicitUtil import nfo_tool
+
+
+class DetectDateInNameTest(unittest.TestCase):
+    def test_formats(self) -> None:
+        self.assertEqual(nfo_tool.detect_date_in_name("video_1999_12_31.mp4"), "1999-12-31")
+        self.assertEqual(nfo_tool.detect_date_in_name("clip 05.03.2021.mkv"), "2021-03-05")
+        self.assertEqual(nfo_tool.detect_date_in_name("clip 21.03.15.mkv"), "2021-03-15")
+        self.assertEqual(nfo_tool.detect_date_in_name("clip 98-03-15.mkv"), "1998-03-15")
+        self.assertIsNone(nfo_tool.detect_date_in_name("no date here.mp4"))
+
+    def test_invalid_match_falls_through(self) -> None:
+        self.assertEqual(nfo_tool.detect_date_in_name("99-01-2023 2022-01-01"), "2022-01-01")
+        self.assertEqual(nfo_tool.detect_date_in_name("2023-13-01 2023-12-01"), "2023-12-01")
+        self.assertIsNone(nfo_tool.detect_date_in_name("2023-13-01"))
+        self.assertIsNone(nfo_tool.detect_date_in_name("2023-01-00"))
+
+    def test_mixed_iso_and_dmy(self) -> None:
+        self.assertEqual(nfo_tool.detect_date_in_name("2022-01-05 10-02-2021"), "2022-01-05")
+        self.assertEqual(nfo_tool.detect_date_in_name("10-02-2021 2022-01-05"), "2021-02-10")
+
+
+class GenerateNfoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.media = self.tmp / "media"
+        self.out = self.tmp / "out"
+        (self.media / "sub").mkdir(parents=True)
+
+    def _generated(self) -> list[str]:
+        return sorted(path.relative_to(self.out).as_posix() for path in self.out.rglob("*.nfo"))
+
+    def test_dotfiles_have_no_extension(self) -> None:
+        for name in (".mp4", ".hidden.mkv", "movie 2021-05-04.MP4", "notes.txt", "sub/ep.m4v"):
+            (self.media / name).write_bytes(b"")
+        nfo_tool.generate_nfo(str(self.media), "movie", str(self.out))
+        self.assertEqual(
+            self._generated(), [".hidden.nfo", "movie 2021-05-04.nfo", "sub/ep.nfo"]
+        )
+
+
+_SMALL_NFO = "<movie><title>Small</title><studio>S</studio></movie>"
+# Over _PRESCAN_SIZE, so it is streamed through _has_all before any full parse.
+_BIG_NFO = (
+    "<movie><title>Big</title>"
+    + "".join(f"<actor><name>A{i}</name><type>Actor</type></actor>" for i in range(3000))
+    + "<studio>S</studio><year>2000</year></movie>"
+)
+
+
+class BatchAddAttributesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "sub").mkdir()
+        self.small = self.root / "small.nfo"
+        self.big = self.root / "sub" / "big.nfo"
+        self.small.write_text(_SMALL_NFO, encoding="utf-8")
+        self.big.write_text(_BIG_NFO, encoding="utf-8")
+        self.assertGreaterEqual(os.path.getsize(self.big), nfo_tool._PRESCAN_SIZE)
+
+    def _run(self, ops: list[tuple], max_workers: int | None = 1) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            nfo_tool.batch_add_attributes(str(self.root), ops, max_workers)
+        return out.getvalue()
+
+    def _state(self, path: Path) -> tuple[bytes, int]:
+        return path.read_bytes(), path.stat().st_mtime_ns
+
+    def test_adds_missing_attributes_once(self) -> None:
+        ops = [("studio", "S"), ("genre", "Drama"), ("actor", "New", {"role": "Lead"}), ("year", "2001")]
+        self._run(ops)
+        root = nfo_tool._parse(str(self.small)).getroot()
+        self.assertEqual([e.text for e in root.iterfind("studio")], ["S"])
+        self.assertEqual([e.text for e in root.iterfind("genre")], ["Drama"])
+        self.assertEqual([e.text for e in root.iterfind("actor/role")], ["Lead"])
+        self.assertEqual(root.findtext("year"), "2001")
+        big = nfo_tool._parse(str(self.big)).getroot()
+        self.assertEqual(big.findtext("year"), "2000")  # An existing year is kept
+        self.assertEqual(len(big.findall("actor")), 3001)
+
+        # Everything is present now, so neither file is written again.
+        before = self._state(self.small), self._state(self.big)
+        self._run(ops)
+        self.assertEqual((self._state(self.small), self._state(self.big)), before)
+
+    def test_present_attributes_leave_files_untouched(self) -> None:
+        before = self._state(self.small), self._state(self.big)
+        self._run([("studio", "S")])
+        self.assertEqual((self._state(self.small), self._state(self.big)), before)
+
+    def test_prescan_skips_full_parse(self) -> None:
+        self.small.unlink()
+        before = self._state(self.big)
+        with mock.patch.object(nfo_tool, "_parse", side_effect=AssertionError("parsed")):
+            self.assertEqual(self._run([("actor", "A2999"), ("studio", "S"), ("year", "1")]), "")
+        self.assertEqual(self._state(self.big), before)
+        self._run([("actor", "Z")])
+        names = [e.text for e in nfo_tool._parse(str(self.big)).getroot().iterfind("actor/name")]
+        self.assertEqual(names[-1], "Z")
+
+    def test_has_all(self) -> None:
+        big = str(self.big)
+        self.assertTrue(nfo_tool._has_all(big, [("year", "1")]))
+        self.assertTrue(nfo_tool._has_all(big, [("actor", "A2999"), ("studio", "S")]))
+        self.assertFalse(nfo_tool._has_all(big, [("actor", "B")]))
+        self.assertFalse(nfo_tool._has_all(big, [("name", "A1")]))  # Not a child of the root
+        self.assertFalse(nfo_tool._has_all(big, [("studio", "X")]))
+
+    def test_unreadable_nfo_is_reported(self) -> None:
+        for i in range(40):  # Enough files for the process pool
+            (self.root / f"m{i}.nfo").write_text(_SMALL_NFO, encoding="utf-8")
+        (self.root / "broken.nfo").write_text("<movie>", encoding="utf-8")
+        gone = self.root / "gone.nfo"
+        iter_files = nfo_tool._iter_files
+
+        def remove_after_listing(root):
+            # gone.nfo is listed, then removed before any file is processed.
+            yield from list(iter_files(root))
+            gone.unlink()
+
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                gone.write_text(_SMALL_NFO, encoding="utf-8")
+                with mock.patch.object(nfo_tool, "_iter_files", remove_after_listing):
+                    output = self._run([("genre", f"G{max_workers}")], max_workers)
+                self.assertIn("Error processing gone.nfo", output)
+                self.assertIn("Error parsing broken.nfo", output)
+                for path in (self.small, self.big, self.root / "m39.nfo"):
+                    self.assertIn(f"<genre>G{max_workers}</genre>", path.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
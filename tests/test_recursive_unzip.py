@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from ExplicitUtil import recursive_unzip
+
+
+class ExtractMemberTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def _files(self, root: Path) -> dict[str, bytes]:
+        return {
+            path.relative_to(root).as_posix(): path.read_bytes()
+            for path in root.rglob("*")
+            if path.is_file()
+        }
+
+    def test_traversal_matches_extractall(self) -> None:
+        names = ["../evil.txt", "/abs/x.txt", "a/./b/../c.txt", "./d/", "ok.txt"]
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                out = self.tmp / f"out{workers}"
+                expected = self.tmp / f"expected{workers}"
+                out.mkdir()
+                zip_path = out / "archive.zip"
+                with zipfile.ZipFile(zip_path, "w") as zf:
+                    for name in names:
+                        zf.writestr(name, "" if name.endswith("/") else name)
+                with zipfile.ZipFile(zip_path) as zf:
+                    zf.extractall(expected)
+                recursive_unzip._extract_one(zip_path, delete_zips=True, member_workers=workers)
+                self.assertEqual(self._files(out), self._files(expected))
+                self.assertTrue((out / "d").is_dir())
+                self.assertFalse((self.tmp / "evil.txt").exists())
+
+    def test_duplicate_names_last_entry_wins(self) -> None:
+        zip_path = self.tmp / "archive.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf, \
+                mock.patch("warnings.warn"):  # zipfile warns about the duplicates
+            for i in range(8):
+                zf.writestr("same.txt", f"entry {i} ".encode() * (1000 * (8 - i)))
+                zf.writestr(f"other{i}.txt", b"x" * 1000)
+        recursive_unzip._extract_one(zip_path, member_workers=4)
+        self.assertEqual((self.tmp / "same.txt").read_bytes(), b"entry 7 " * 1000)
+        self.assertEqual(len(list(self.tmp.glob("other*.txt"))), 8)
+
+    def test_windows_names_are_sanitized(self) -> None:
+        info = zipfile.ZipInfo("dir:1./sub\\name?..")
+        with mock.patch.object(os, "sep", "\\"), mock.patch.object(os, "altsep", "/"):
+            target = recursive_unzip._member_target(info, Path("out"))
+        self.assertEqual(target, Path("out") / "dir_1\\sub\\name_")
+
+    def test_empty_name_is_skipped(self) -> None:
+        self.assertIsNone(recursive_unzip._member_target(zipfile.ZipInfo("../"), Path("out")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from ExplicitUtil import remove_empty
+
+
+class RemoveEmptyFoldersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def _run(self, dry_run: bool = False) -> int:
+        with redirect_stdout(io.StringIO()):
+            return remove_empty.remove_empty_folders(str(self.root), dry_run)
+
+    def _dirs(self) -> list[str]:
+        return sorted(path.relative_to(self.root).as_posix() for path in self.root.rglob("*") if path.is_dir())
+
+    def test_removes_nested_empty_folders(self) -> None:
+        for path in ("a/b/c", "d/e", "f"):
+            (self.root / path).mkdir(parents=True)
+        (self.root / "d" / "keep.txt").write_bytes(b"")
+        self.assertEqual(self._run(dry_run=True), 5)
+        self.assertEqual(self._dirs(), ["a", "a/b", "a/b/c", "d", "d/e", "f"])
+        self.assertEqual(self._run(), 5)
+        self.assertEqual(self._dirs(), ["d"])
+        self.assertTrue(self.root.is_dir())
+
+    def test_symlinks_are_not_followed(self) -> None:
+        (self.root / "target" / "inner").mkdir(parents=True)
+        (self.root / "target" / "keep.txt").write_bytes(b"")
+        (self.root / "holder").mkdir()
+        os.symlink(self.root / "target", self.root / "holder" / "link")
+        self.assertEqual(self._run(), 1)  # Only target/inner
+        self.assertEqual(self._dirs(), ["holder", "holder/link", "target"])
+
+    def test_deep_tree(self) -> None:
+        depth = sys.getrecursionlimit() + 100
+        path = str(self.root)
+        for _ in range(depth):  # os.makedirs recurses per level itself
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        self.assertEqual(self._run(), depth)
+        self.assertEqual(self._dirs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
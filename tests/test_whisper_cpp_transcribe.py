@@ -0,0 +1,97 @@
+import io
+import queue
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from ExplicitUtil import whisper_cpp_transcribe
+
+_COMMAND = {
+    "threads": 1,
+    "max_context": 0,
+    "translate": True,
+    "logprob_thold": -0.5,
+    "no_speech_thold": 0.3,
+    "word_thold": 0.5,
+    "best_of": 5,
+    "language": "auto",
+    "entropy-thold": 2.8,
+    "output_format": "-osrt",
+}
+
+
+class WhisperWorkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def _run_worker(self, job_queue: queue.Queue, command: dict) -> str:
+        """Run one worker until it stops and return what it printed."""
+        out = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(out):
+            worker = threading.Thread(
+                target=whisper_cpp_transcribe.whisper_worker,
+                args=(job_queue, 4, 1, command, 0.0),
+            )
+            worker.start()
+            worker.join(timeout=10)
+        self.assertFalse(worker.is_alive())
+        return out.getvalue()
+
+    def test_incomplete_config_marks_jobs_done(self) -> None:
+        job_queue = queue.Queue()
+        for name in ("a", "b"):
+            audio = self.tmp / f"{name}.wav"
+            audio.write_bytes(b"RIFF")
+            job_queue.put(whisper_cpp_transcribe._make_job(
+                self.tmp / f"{name}.mp4", self.tmp / "whisper-cli", self.tmp / "model.bin", "", audio
+            ))
+        job_queue.put(None)
+        output = self._run_worker(job_queue, {"threads": 1})
+        self.assertIn("missing option 'max_context'", output)
+        # Only the stop sentinel is left; otherwise job_queue.join() would block forever.
+        self.assertEqual(job_queue.unfinished_tasks, 1)
+
+    def test_missing_ffmpeg_is_reported_as_ffmpeg(self) -> None:
+        job_queue = queue.Queue()
+        job_queue.put(whisper_cpp_transcribe._make_job(
+            self.tmp / "a.mp4", self.tmp / "whisper-cli", self.tmp / "model.bin", "", None
+        ))
+        job_queue.put(None)
+        missing = str(self.tmp / "no-ffmpeg")
+        with mock.patch.object(whisper_cpp_transcribe, "_ffmpeg_command", return_value=[missing]):
+            output = self._run_worker(job_queue, _COMMAND)
+        self.assertIn(f"FFmpeg executable '{missing}' not found", output)
+        self.assertNotIn("Whisper executable not found", output)
+        self.assertEqual(job_queue.unfinished_tasks, 1)
+
+    def test_incomplete_config_stops_before_starting_workers(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out), \
+                mock.patch.object(whisper_cpp_transcribe, "_load_whisper_command", return_value={}), \
+                mock.patch.object(whisper_cpp_transcribe, "whisper_worker") as worker:
+            whisper_cpp_transcribe.transcribe_videos(self.tmp, self.tmp)
+        self.assertIn("missing option 'max_context'", out.getvalue())
+        worker.assert_not_called()
+
+
+class IterVideoFilesTest(unittest.TestCase):
+    def test_suffix_matching(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "sub").mkdir()
+            for name in (".mp4", ".hidden.mkv", "a.MP4", "b.mkv.txt", "sub/c.mkv", "mp4"):
+                (root / name).write_bytes(b"")
+            found = sorted(
+                path.relative_to(root).as_posix()
+                for path in whisper_cpp_transcribe._iter_video_files(tmp, (".mp4", ".mkv"))
+            )
+        self.assertEqual(found, [".hidden.mkv", "a.MP4", "sub/c.mkv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from ExplicitUtil import zip_and_move
+
+
+class ZipDirectoryTest(unittest.TestCase):
+    """Round trips for zip_directory, which appends members through zipfile internals."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.folder = self.tmp / "leaf"
+        (self.folder / "sub").mkdir(parents=True)
+        self.files = {
+            "leaf/a.txt": b"hello " * 1000,
+            "leaf/empty": b"",
+            "leaf/video.mp4": os.urandom(100_000),
+            "leaf/sub/b.log": os.urandom(50) + b"x" * 200_000,
+        }
+        for i in range(50):
+            self.files[f"leaf/sub/tiny{i}.txt"] = f"tiny {i}\n".encode()
+        for arcname, data in self.files.items():
+            (self.tmp / arcname).write_bytes(data)
+
+    def assertArchive(self, zip_path: Path) -> None:
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertIsNone(zf.testzip())
+            contents = {info.filename: zf.read(info) for info in zf.infolist()}
+        self.assertEqual(contents, self.files)
+
+    def test_round_trip_to_path(self) -> None:
+        zip_path = self.tmp / "out.zip"
+        zip_and_move.zip_directory(self.folder, zip_path, max_workers=2)
+        self.assertArchive(zip_path)
+
+    def test_round_trip_through_hashing_writer(self) -> None:
+        zip_path = self.tmp / "out.zip"
+        with open(zip_path, "wb") as f, zip_and_move.HashingWriter(f) as writer:
+            zip_and_move.zip_directory(self.folder, writer, max_workers=2)
+        self.assertArchive(zip_path)
+        self.assertEqual(writer.hexdigest(), hashlib.sha256(zip_path.read_bytes()).hexdigest())
+
+    def test_window_is_bounded_by_bytes(self) -> None:
+        submit = zip_and_move._submit_batch
+        in_flight = []
+
+        def checked_submit(executor, zipf, pending, batch, batch_bytes, *args):
+            submit(executor, zipf, pending, batch, batch_bytes, *args)
+            in_flight.append(sum(size for _, size in pending) if len(pending) > 1 else 0)
+
+        zip_path = self.tmp / "out.zip"
+        with mock.patch.object(zip_and_move, "_MAX_IN_FLIGHT", 150_000), \
+                mock.patch.object(zip_and_move, "_submit_batch", checked_submit):
+            zip_and_move.zip_directory(self.folder, zip_path, max_workers=8)
+        self.assertArchive(zip_path)
+        self.assertLessEqual(max(in_flight), 150_000)
+
+    def test_large_stored_member(self) -> None:
+        # Over _PARALLEL_MAX_SIZE, so it is copied with HashingWriter.copy_range.
+        big = os.urandom(1 << 20) * 65
+        (self.folder / "big.mkv").write_bytes(big)
+        (self.folder / "z.txt").write_bytes(b"after the big member")
+        self.files["leaf/big.mkv"] = big
+        self.files["leaf/z.txt"] = b"after the big member"
+        for has_copy_range in (zip_and_move._HAS_COPY_RANGE, False):
+            with self.subTest(has_copy_range=has_copy_range), \
+                    mock.patch.object(zip_and_move, "_HAS_COPY_RANGE", has_copy_range):
+                zip_path = self.tmp / "out.zip"
+                with open(zip_path, "wb") as f, zip_and_move.HashingWriter(f) as writer:
+                    zip_and_move.zip_directory(self.folder, writer, max_workers=2)
+                self.assertArchive(zip_path)
+                with zipfile.ZipFile(zip_path) as zf:
+                    self.assertEqual(zf.getinfo("leaf/big.mkv").compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(writer.hexdigest(), hashlib.sha256(zip_path.read_bytes()).hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()